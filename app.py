@@ -1,8 +1,9 @@
 import os
-import json
+import re
 import shutil
 import tempfile
-from flask import Flask, render_template, request, jsonify
+import time
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 from werkzeug.utils import secure_filename
 from pathlib import Path
 from utils.project_manager import ProjectManager
@@ -44,7 +45,6 @@ def index():
 @app.route('/api/wordpress-versions')
 def get_wordpress_versions():
     """Get available WordPress Docker image versions from Docker Hub"""
-    import time
     
     # Check cache first
     current_time = time.time()
@@ -132,6 +132,10 @@ def get_wordpress_versions():
         
         return jsonify(fallback_versions)
 
+# Docker Hub tag parsing runs for every tag on each versions refresh
+_TAG_VERSION_RE = re.compile(r'^(\d+\.\d+(?:\.\d+)?)(?:-php(\d+\.\d+))?(?:-(.+))?$')
+_VERSION_PRIORITY_RE = re.compile(r'^(\d+)\.(\d+)(?:\.(\d+))?')
+
 def parse_wordpress_tag(tag):
     """Parse WordPress Docker tag and create meaningful description"""
     tag_lower = tag.lower()
@@ -150,11 +154,8 @@ def parse_wordpress_tag(tag):
         php_version = tag.replace('php', '')
         return f'Latest WordPress with PHP {php_version}'
     
-    # Version number tags
-    import re
-    
-    # Match version patterns like 6.4, 6.4.1, 6.4-php8.1, etc.
-    version_match = re.match(r'^(\d+\.\d+(?:\.\d+)?)(?:-php(\d+\.\d+))?(?:-(.+))?$', tag)
+    # Version number tags like 6.4, 6.4.1, 6.4-php8.1, etc.
+    version_match = _TAG_VERSION_RE.match(tag)
     if version_match:
         wp_version = version_match.group(1)
         php_version = version_match.group(2)
@@ -185,8 +186,7 @@ def get_version_priority(version):
         return 10 + float(php_ver) if php_ver.replace('.', '').isdigit() else 100
     
     # WordPress version numbers
-    import re
-    version_match = re.match(r'^(\d+)\.(\d+)(?:\.(\d+))?', version)
+    version_match = _VERSION_PRIORITY_RE.match(version)
     if version_match:
         major = int(version_match.group(1))
         minor = int(version_match.group(2))
@@ -320,6 +320,19 @@ def project_logs(project_name):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/projects/<project_name>/logs/stream')
+def stream_project_logs(project_name):
+    """Stream project logs as Server-Sent Events"""
+    tail = request.args.get('tail', 100, type=int)
+    follow = request.args.get('follow', '1') != '0'
+
+    def generate():
+        for line in project_manager.stream_project_logs(project_name, tail, follow):
+            yield f"data: {line}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/projects/<project_name>/debug-logs')
 def project_debug_logs(project_name):
     """Get WordPress debug logs"""
@@ -403,6 +416,7 @@ def upload_database(project_name):
         
         # Get form options
         backup_before_upload = request.form.get('backup_before_upload') == 'on'
+        keep_repaired = request.form.get('keep_repaired') == 'on'
         url_search = (request.form.get('url_search') or '').strip() or None
         url_replace = (request.form.get('url_replace') or '').strip() or None
         
@@ -422,7 +436,8 @@ def upload_database(project_name):
             db_file_path=str(db_file_path),
             backup_before_import=backup_before_upload,
             url_search=url_search,
-            url_replace=url_replace
+            url_replace=url_replace,
+            keep_repaired=keep_repaired
         )
         
         if result['success']:
@@ -762,14 +777,11 @@ def regenerate_ssl(project_name):
         
         # Get project config to find domain
         project_path = project_manager.projects_dir / project_name
-        config_path = project_path / "config.json"
+        config = project_manager.config_manager.read_project_config(project_path)
         
-        if not config_path.exists():
+        if not config:
             return jsonify({'error': 'Project config not found'}), 404
         
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        
         domain = config.get('domain', '').split('/')[0]
         if not domain:
             return jsonify({'error': 'Project domain not found'}), 400
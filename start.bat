@@ -28,8 +28,9 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 
-REM Check if Docker Compose is installed
-docker-compose --version >nul 2>&1
+REM Check if Docker Compose is installed (prefer the v2 plugin, accept v1)
+docker compose version >nul 2>&1
+if %errorlevel% neq 0 docker-compose --version >nul 2>&1
 if %errorlevel% neq 0 (
     echo ❌ Docker Compose is required but not installed.
     echo Please install Docker Compose and try again.
@@ -25,8 +25,8 @@ if ! docker info &> /dev/null; then
     exit 1
 fi
 
-# Check if Docker Compose is installed
-if ! command -v docker-compose &> /dev/null; then
+# Check if Docker Compose is installed (prefer the v2 plugin, accept v1)
+if ! docker compose version &> /dev/null && ! command -v docker-compose &> /dev/null; then
     echo "❌ Docker Compose is required but not installed."
     echo "Please install Docker Compose and try again."
     exit 1
@@ -66,14 +66,11 @@ def test_docker():
 def test_docker_compose():
     """Test if Docker Compose is installed"""
     try:
-        result = subprocess.run(['docker-compose', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"✅ Docker Compose installed: {result.stdout.strip()}")
-            return True
-        else:
-            print("❌ Docker Compose not found")
-            return False
-    except FileNotFoundError:
+        from utils.docker_compose_detect import get_compose_command, get_compose_version
+        version = get_compose_version()
+        print(f"✅ Docker Compose installed: {' '.join(get_compose_command())} {version}")
+        return True
+    except RuntimeError:
         print("❌ Docker Compose not installed")
         return False
 
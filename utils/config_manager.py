@@ -1,171 +1,108 @@
+import re
 from pathlib import Path
 
+from . import fast_json
+from .templating import ConfigTemplate
+from .fs_utils import atomic_write, write_if_changed
 
-class ConfigManager:
-    """Handles creation of configuration files (nginx, Makefile, etc.)"""
-    
-    def __init__(self):
-        pass
-    
-    def create_nginx_config(self, project_path, project_name, domain, enable_ssl, subfolder=""):
-        """Create nginx configuration"""
-        
-        ssl_config = """
+# Config file skeletons, kept at module level so they are built once per process.
+# ConfigTemplate only substitutes `${lowercase}` placeholders, so nginx, Make and
+# Compose `${UPPERCASE}` syntax is written verbatim.
+
+_NGINX_SSL_CONFIG = """
     listen 443 ssl;
     http2 on;
     ssl_certificate /etc/nginx/ssl/cert.pem;
     ssl_certificate_key /etc/nginx/ssl/key.pem;
     ssl_protocols TLSv1.2 TLSv1.3;
-    ssl_ciphers HIGH:!aNULL:!MD5;""" if enable_ssl else ""
-        
-        # Handle subfolder routing
-        location_config = "/"
-        if subfolder:
-            location_config = f"/{subfolder}/"
-        
-        # Build nginx configuration based on subfolder setup
-        if subfolder:
-            nginx_content = f"""server {{
-    listen 80;{ssl_config}
-    server_name {domain.split('/')[0]};
-    
-    root /var/www/html;
-    index index.php index.html index.htm;
-    
-    client_max_body_size 100M;
-    
-    # Handle WordPress files in subfolder context
-    location ~ ^/{subfolder}/(wp-content|wp-includes|wp-admin)/ {{
-        rewrite ^/{subfolder}/(.*)$ /$1 last;
-    }}
+    ssl_ciphers HIGH:!aNULL:!MD5;"""
+
+# Extra locations for a site served from /<subfolder>/, inserted ahead of `location /`
+_NGINX_SUBFOLDER_LOCATIONS = ConfigTemplate("""    # Handle WordPress files in subfolder context
+    location ~ ^/${subfolder}/(wp-content|wp-includes|wp-admin)/ {
+        rewrite ^/${subfolder}/(.*)$ /$1 last;
+    }
     
     # Handle WordPress core PHP files in subfolder context
-    location ~ ^/{subfolder}/(wp-login\\.php|wp-cron\\.php|wp-mail\\.php|wp-signup\\.php|wp-activate\\.php|wp-trackback\\.php|xmlrpc\\.php)$ {{
-        rewrite ^/{subfolder}/(.*)$ /$1 last;
-    }}
+    location ~ ^/${subfolder}/(wp-login\\.php|wp-cron\\.php|wp-mail\\.php|wp-signup\\.php|wp-activate\\.php|wp-trackback\\.php|xmlrpc\\.php)$ {
+        rewrite ^/${subfolder}/(.*)$ /$1 last;
+    }
     
     # Handle root access - redirect to subfolder
-    location = / {{
+    location = / {
         try_files $uri $uri/ /index.php?$args;
-    }}
+    }
     
-    # Handle /{subfolder} subfolder
-    location /{subfolder} {{
-        return 301 /{subfolder}/;
-    }}
+    # Handle /${subfolder} subfolder
+    location /${subfolder} {
+        return 301 /${subfolder}/;
+    }
     
-    location /{subfolder}/ {{
+    location /${subfolder}/ {
         try_files $uri $uri/ /index.php?$args;
-    }}
+    }
     
     # Handle all other requests
-    location / {{
-        try_files $uri $uri/ /index.php?$args;
-    }}
-    
-    # PHP-FPM processing
-    location ~ \\.php$ {{
-        try_files $uri =404;
-        fastcgi_split_path_info ^(.+\\.php)(/.+)$;
-        fastcgi_pass wordpress:9000;
-        fastcgi_index index.php;
-        fastcgi_param SCRIPT_FILENAME $document_root$fastcgi_script_name;
-        include fastcgi_params;
-    }}
-    
-    # Security
-    location ~ /\\.ht {{
-        deny all;
-    }}
-    
-    # Static files optimization
-    location = /favicon.ico {{
-        log_not_found off;
-        access_log off;
-    }}
-    
-    location = /robots.txt {{
-        log_not_found off;
-        access_log off;
-        allow all;
-    }}
-    
-    location ~* \\.(css|gif|ico|jpeg|jpg|js|png|svg|woff|woff2|ttf|eot)$ {{
-        expires 1y;
-        add_header Cache-Control "public, immutable";
-        log_not_found off;
-    }}
-}}
-"""
-        else:
-            nginx_content = f"""server {{
-    listen 80;{ssl_config}
-    server_name {domain.split('/')[0]};
+""")
+
+_NGINX_SERVER_TEMPLATE = ConfigTemplate("""server {
+    listen 80;${ssl_config}
+    server_name ${server_name};
     
     root /var/www/html;
     index index.php index.html index.htm;
     
     client_max_body_size 100M;
     
-    location / {{
+${subfolder_locations}    location / {
         try_files $uri $uri/ /index.php?$args;
-    }}
+    }
     
     # PHP-FPM processing
-    location ~ \\.php$ {{
+    location ~ \\.php$ {
         try_files $uri =404;
         fastcgi_split_path_info ^(.+\\.php)(/.+)$;
         fastcgi_pass wordpress:9000;
         fastcgi_index index.php;
         fastcgi_param SCRIPT_FILENAME $document_root$fastcgi_script_name;
         include fastcgi_params;
-    }}
+    }
     
     # Security
-    location ~ /\\.ht {{
+    location ~ /\\.ht {
         deny all;
-    }}
+    }
     
     # Static files optimization
-    location = /favicon.ico {{
+    location = /favicon.ico {
         log_not_found off;
         access_log off;
-    }}
+    }
     
-    location = /robots.txt {{
+    location = /robots.txt {
         log_not_found off;
         access_log off;
         allow all;
-    }}
+    }
     
-    location ~* \\.(css|gif|ico|jpeg|jpg|js|png|svg|woff|woff2|ttf|eot)$ {{
+    location ~* \\.(css|gif|ico|jpeg|jpg|js|png|svg|woff|woff2|ttf|eot)$ {
         expires 1y;
         add_header Cache-Control "public, immutable";
         log_not_found off;
-    }}
-}}
-"""
-        
-        with open(project_path / "nginx.conf", 'w') as f:
-            f.write(nginx_content)
-    
-    def create_makefile(self, project_path, project_name, domain, db_file_path=None):
-        """Create Makefile for the project"""
-        
-        db_import_command = ""
-        if db_file_path:
-            # Use the project-relative path for the Makefile
-            relative_db_path = f"data/{Path(db_file_path).name}"
-            db_import_command = f"""
+    }
+}
+""")
+
+_MAKEFILE_DB_IMPORT_TEMPLATE = ConfigTemplate("""
 db-import: ## Import database from file
-\t@echo "Importing database from {relative_db_path}..."
-\t@$(COMPOSE_CMD) exec -T mysql mysql -u${{DB_USER}} -p${{DB_PASSWORD}} ${{DB_NAME}} < "{relative_db_path}"
+\t@echo "Importing database from ${relative_db_path}..."
+\t@$(COMPOSE_CMD) exec -T mysql mysql -u${DB_USER} -p${DB_PASSWORD} ${DB_NAME} < "${relative_db_path}"
 \t@echo "Database imported successfully!"
-"""
-        
-        makefile_content = f"""# WordPress Local Development Environment Makefile
-# Project: {project_name}
-# Domain: {domain}
+""")
+
+_MAKEFILE_TEMPLATE = ConfigTemplate("""# WordPress Local Development Environment Makefile
+# Project: ${project_name}
+# Domain: ${domain}
 
 include .env
 
@@ -175,13 +112,13 @@ COMPOSE_CMD ?= docker compose
 
 help: ## Show this help message
 \t@echo "Available commands:"
-\t@grep -E '^[a-zA-Z_-]+:.*?## .*$$' $(MAKEFILE_LIST) | awk 'BEGIN {{FS = ":.*?## "}}; {{printf "\\033[36m%-20s\\033[0m %s\\n", $$1, $$2}}'
+\t@grep -E '^[a-zA-Z_-]+:.*?## .*$$' $(MAKEFILE_LIST) | awk 'BEGIN {FS = ":.*?## "}; {printf "\\033[36m%-20s\\033[0m %s\\n", $$1, $$2}'
 
 start: ## Start the WordPress environment
 \t@echo "Starting WordPress environment..."
 \t@$(COMPOSE_CMD) up -d
-\t@echo "WordPress is running at: https://${{DOMAIN}}"
-\t@echo "phpMyAdmin is running at: http://localhost:${{PHPMYADMIN_PORT}}"
+\t@echo "WordPress is running at: https://${DOMAIN}"
+\t@echo "phpMyAdmin is running at: http://localhost:${PHPMYADMIN_PORT}"
 
 stop: ## Stop the WordPress environment
 \t@echo "Stopping WordPress environment..."
@@ -212,9 +149,9 @@ shell: ## Access WordPress container shell
 
 db-export: ## Export database to file
 \t@echo "Exporting database..."
-\t@$(COMPOSE_CMD) exec mysql mysqldump -u${{DB_USER}} -p${{DB_PASSWORD}} ${{DB_NAME}} > ./data/export_$(shell date +%Y%m%d_%H%M%S).sql
+\t@$(COMPOSE_CMD) exec mysql mysqldump -u${DB_USER} -p${DB_PASSWORD} ${DB_NAME} > ./data/export_$(shell date +%Y%m%d_%H%M%S).sql
 \t@echo "Database exported to ./data/"
-{db_import_command}
+${db_import_command}
 clean: ## Clean up containers and volumes
 \t@echo "Cleaning up..."
 \t@$(COMPOSE_CMD) down -v
@@ -222,37 +159,127 @@ clean: ## Clean up containers and volumes
 
 status: ## Show container status
 \t@$(COMPOSE_CMD) ps
-"""
+""")
+
+# Parsed .env files keyed by path -> (st_mtime_ns, st_size, env dict)
+_ENV_CACHE = {}
+
+# One `KEY=value` assignment per line; comments and blank lines never match.
+# Whitespace around the line is ignored and the value may itself contain '='.
+_ENV_LINE_RE = re.compile(r'^[ \t]*([^#=\s][^=\n]*)=(.*?)[ \t\r]*$', re.MULTILINE)
+
+
+def load_env_file(project_path):
+    """Read a project's .env file into a dict, re-parsing only when it changes
+
+    Returns a new dict on every call; an empty one if the file is missing or
+    unreadable.
+    """
+    env_file = project_path / '.env'
+    key = str(env_file)
+    try:
+        st = env_file.stat()
+    except OSError:
+        _ENV_CACHE.pop(key, None)
+        return {}
+    
+    cached = _ENV_CACHE.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return dict(cached[2])
+    
+    try:
+        with open(env_file, 'r') as f:
+            env_vars = dict(_ENV_LINE_RE.findall(f.read()))
+    except Exception:
+        return {}
+    
+    _ENV_CACHE[key] = (st.st_mtime_ns, st.st_size, env_vars)
+    return dict(env_vars)
+
+
+class ConfigManager:
+    """Handles creation of configuration files (nginx, Makefile, etc.)"""
+    
+    def __init__(self):
+        # Parsed config.json per path, keyed on (st_mtime_ns, st_size) so
+        # repeated reads (e.g. the UI polling list_projects) skip the parse
+        self._config_cache = {}
+    
+    def create_nginx_config(self, project_path, project_name, domain, enable_ssl, subfolder=""):
+        """Create nginx configuration, returning True if nginx.conf changed"""
+        
+        # Build nginx configuration based on subfolder setup
+        subfolder_locations = ""
+        if subfolder:
+            subfolder_locations = _NGINX_SUBFOLDER_LOCATIONS.substitute(subfolder=subfolder)
+        
+        nginx_content = _NGINX_SERVER_TEMPLATE.substitute({
+            'ssl_config': _NGINX_SSL_CONFIG if enable_ssl else "",
+            'server_name': domain.split('/')[0],
+            'subfolder_locations': subfolder_locations,
+        })
+        
+        # Written in place, not atomically: nginx.conf is bind-mounted as a single
+        # file, and a rename would leave a running container on the old inode
+        return write_if_changed(project_path / "nginx.conf", nginx_content, atomic=False)
+    
+    def create_makefile(self, project_path, project_name, domain, db_file_path=None):
+        """Create Makefile for the project, returning True if it changed"""
+        
+        db_import_command = ""
+        if db_file_path:
+            # Use the project-relative path for the Makefile
+            relative_db_path = f"data/{Path(db_file_path).name}"
+            db_import_command = _MAKEFILE_DB_IMPORT_TEMPLATE.substitute(relative_db_path=relative_db_path)
+        
+        makefile_content = _MAKEFILE_TEMPLATE.substitute({
+            'project_name': project_name,
+            'domain': domain,
+            'db_import_command': db_import_command,
+        })
         
-        with open(project_path / "Makefile", 'w') as f:
-            f.write(makefile_content)
+        return write_if_changed(project_path / "Makefile", makefile_content)
     
     def create_project_config(self, project_path, config_data):
         """Create project configuration JSON file"""
-        import json
-        
-        with open(project_path / "config.json", 'w') as f:
-            json.dump(config_data, f, indent=2)
+        config_file = project_path / "config.json"
+        atomic_write(config_file, fast_json.dumps(config_data, indent=True))
+        self._remember_config(config_file, config_data)
+    
+    def _remember_config(self, config_file, config):
+        """Store a parsed config in the cache, keyed on the file's current stat"""
+        st = config_file.stat()
+        self._config_cache[str(config_file)] = (st.st_mtime_ns, st.st_size, config)
     
     def read_project_config(self, project_path):
-        """Read project configuration from JSON file"""
-        import json
+        """Read project configuration from JSON file
         
+        Returns a fresh top-level copy of the cached dict, so callers may
+        add or replace keys without affecting the cache.
+        """
         config_file = project_path / "config.json"
-        if not config_file.exists():
+        try:
+            st = config_file.stat()
+        except OSError:
+            self._config_cache.pop(str(config_file), None)
             return None
         
+        cached = self._config_cache.get(str(config_file))
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return dict(cached[2])
+        
         try:
-            with open(config_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
+            with open(config_file, 'rb') as f:
+                config = fast_json.loads(f.read())
+        except (OSError, fast_json.JSONDecodeError, UnicodeDecodeError) as e:
             print(f"Warning: could not parse config.json: {e}")
             return None
+        
+        self._config_cache[str(config_file)] = (st.st_mtime_ns, st.st_size, config)
+        return dict(config)
 
     def update_project_config(self, project_path, updates):
         """Update project configuration file with new values"""
-        import json
-        
         config = self.read_project_config(project_path)
         if config is None:
             return False
@@ -262,8 +289,9 @@ status: ## Show container status
         
         # Save updated config
         try:
-            with open(project_path / "config.json", 'w') as f:
-                json.dump(config, f, indent=2)
+            config_file = project_path / "config.json"
+            atomic_write(config_file, fast_json.dumps(config, indent=True))
+            self._remember_config(config_file, config)
             return True
         except Exception as e:
             print(f"Warning: could not write config.json: {e}")
@@ -275,25 +303,11 @@ status: ## Show container status
         for key, value in env_vars.items():
             env_content += f"{key}={value}\n"
         
-        with open(project_path / ".env", 'w') as f:
-            f.write(env_content)
+        atomic_write(project_path / ".env", env_content)
     
     def read_env_file(self, project_path):
         """Read environment variables from .env file"""
-        env_file = project_path / '.env'
-        env_vars = {}
-        
-        if env_file.exists():
-            try:
-                with open(env_file, 'r') as f:
-                    for line in f:
-                        if '=' in line and not line.startswith('#'):
-                            key, value = line.strip().split('=', 1)
-                            env_vars[key] = value
-            except Exception:
-                pass
-        
-        return env_vars
+        return load_env_file(project_path)
     
     def create_gitignore(self, project_path):
         """Create .gitignore file for WordPress projects"""
@@ -347,8 +361,7 @@ data/*.sql.gz
 *.temp
 """
         
-        with open(project_path / ".gitignore", 'w') as f:
-            f.write(gitignore_content)
+        write_if_changed(project_path / ".gitignore", gitignore_content)
     
     def create_readme(self, project_path, project_name, domain):
         """Create README.md file for the project"""
@@ -417,5 +430,4 @@ make restart
 ```
 """
         
-        with open(project_path / "README.md", 'w') as f:
-            f.write(readme_content)
+        write_if_changed(project_path / "README.md", readme_content)
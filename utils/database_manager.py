@@ -1,10 +1,116 @@
+import codecs
 import gzip
+import mmap
+import os
+import shutil
+import stat
 import subprocess
 import re
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 from .docker_compose_detect import compose_command
+from .config_manager import load_env_file
+
+# INSERT IGNORE skips rows that violate unique constraints (last one wins per key),
+# avoiding duplicate-key errors common with WordPress plugin tables (e.g. 404
+# detectors); unique_checks=0 does not reliably suppress 1062
+_INSERT_INTO_RE = re.compile(rb'\bINSERT\s+INTO\s+', re.IGNORECASE)
+
+# Dropped from dumps by the repair pass in one str.translate(): U+FFFD (what
+# invalid UTF-8 decodes to) and the C0 controls other than tab, LF and CR, plus DEL
+_REPAIR_DELETE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F, 0xFFFD]
+)
+
+# External decompressors preferred over the gzip module, fastest first: ISA-L's
+# igzip inflates with SIMD, pigz at least moves inflating off our process
+_GUNZIP_TOOLS = ('igzip', 'pigz')
+
+# How much of mysql's stderr an import keeps for its error message
+_STDERR_TAIL_LINES = 200
+
+# Appended after the dump to restore the session settings from _sql_preamble()
+_SQL_EPILOGUE = "\n\nSET SESSION foreign_key_checks = 1;\n"
+
+
+@lru_cache(maxsize=None)
+def _gunzip_command():
+    """Command that decompresses gzip from stdin to stdout, or None to use the gzip module"""
+    for tool in _GUNZIP_TOOLS:
+        path = shutil.which(tool)
+        if path:
+            return (path, '-dc')
+    return None
+
+
+def _is_decompressed(src):
+    """True if src, from _open_database_file(), is the decompressed stream of a gzipped dump"""
+    return isinstance(src, gzip.GzipFile) or not stat.S_ISREG(os.fstat(src.fileno()).st_mode)
+
+
+class _DecompressError(OSError):
+    """An external decompressor failed on a truncated or corrupt dump"""
+
+
+class _DecompressorStream:
+    """
+    The stdout of an external decompressor, read like a binary file.
+
+    The decompressor's exit status is checked as soon as its output reaches
+    EOF, before the caller sees the end of the stream. A corrupt dump thus
+    raises _DecompressError while mysql is still reading stdin, rather than
+    after the end of the stream has been treated as a complete import.
+    """
+
+    def __init__(self, proc, name):
+        self._proc = proc
+        self._name = name
+        self.error = None  # None until collected, '' on success
+
+    def fileno(self):
+        return self._proc.stdout.fileno()
+
+    def read(self, size=-1):
+        data = self._proc.stdout.read(size)
+        if not data and size != 0:
+            self.check()
+        return data
+
+    def __iter__(self):
+        yield from self._proc.stdout
+        self.check()
+
+    def collect(self):
+        """Wait for the decompressor and remember its error message, if any"""
+        if self.error is None:
+            returncode = self._proc.wait()
+            message = self._proc.stderr.read().decode('utf-8', errors='replace').strip()
+            self.error = f"{self._name} could not decompress the file: {message}" if returncode > 0 else ''
+
+    def check(self):
+        """Raise _DecompressError if the decompressor failed"""
+        self.collect()
+        if self.error:
+            raise _DecompressError(self.error)
+
+
+def _iter_lines(chunks):
+    """Re-split an iterable of byte chunks into newline-terminated lines"""
+    pending = b''
+    for chunk in chunks:
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + b'\n'
+    if pending:
+        yield pending
 
 
 class DatabaseLogger:
@@ -29,130 +135,252 @@ class DatabaseManager:
     """Handles all database-related operations"""
     
     def __init__(self):
-        pass
+        # project path -> mysql container name confirmed by `docker inspect`
+        self._mysql_containers = {}
     
-    def _is_gzipped_file(self, file_path):
-        """Check if a file is gzipped by reading its magic bytes"""
-        try:
-            with open(file_path, 'rb') as f:
-                # Read first 2 bytes to check for gzip magic number (0x1f, 0x8b)
-                magic = f.read(2)
-                return magic == b'\x1f\x8b'
-        except Exception:
-            return False
-    
-    def _read_database_file(self, file_path, logger=None):
-        """Read database file content, handling both regular and gzipped files"""
-        try:
-            file_path_obj = Path(file_path)
-            if logger:
-                logger.log(f"📖 Reading database file: {file_path_obj.name}")
-            
-            # Check if file is gzipped by extension or magic bytes
-            is_gzipped = (
-                file_path_obj.suffix.lower() == '.gz' or 
-                file_path_obj.name.lower().endswith('.sql.gz') or
-                self._is_gzipped_file(file_path)
-            )
-            
-            if logger:
-                logger.log(f"   📦 File type detected: {'Gzipped' if is_gzipped else 'Plain text'}")
-            
-            if is_gzipped:
-                if logger:
-                    logger.log(f"   📦 Detected gzipped database file, decompressing...")
-                try:
-                    # Try UTF-8 first
-                    with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                        return f.read()
-                except UnicodeDecodeError:
-                    if logger:
-                        logger.log(f"   ⚠️  UTF-8 decode failed, trying with error handling...")
-                    # Fallback: read with error handling to skip invalid bytes
-                    with gzip.open(file_path, 'rt', encoding='utf-8', errors='replace') as f:
-                        content = f.read()
-                        if logger:
-                            logger.log(f"   ✅ File read with {content.count('�')} replacement characters")
-                        return content
-            else:
-                if logger:
-                    logger.log(f"   📄 Reading plain text database file...")
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        return f.read()
-                except UnicodeDecodeError:
-                    if logger:
-                        logger.log(f"   ⚠️  UTF-8 decode failed, trying with error handling...")
-                    # Fallback: read with error handling to skip invalid bytes
-                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                        content = f.read()
-                        if logger:
-                            logger.log(f"   ✅ File read with {content.count('�')} replacement characters")
-                        return content
-                    
-        except Exception as e:
-            # One more fallback: try reading as binary and decode with latin1 (which maps all bytes)
+    def _mysql_command(self, project_path, *args):
+        """
+        Command running args in the project's mysql container, with stdin attached.
+
+        Uses `docker exec` on the container named in docker-compose.yml, which
+        skips loading the compose project on every import attempt and backup.
+        The name is checked with one `docker inspect` per project and then
+        remembered; if there is no such container, `compose exec` is used.
+        """
+        key = str(project_path)
+        container = self._mysql_containers.get(key)
+        if container is None:
+            env_vars = load_env_file(project_path)
+            container = f"{env_vars.get('PROJECT_NAME', Path(project_path).name)}_mysql"
             try:
-                if logger:
-                    logger.log(f"   🔄 Trying binary mode with latin1 encoding as final fallback...")
-                if is_gzipped:
-                    with gzip.open(file_path, 'rb') as f:
-                        content_bytes = f.read()
+                found = subprocess.run(
+                    ['docker', 'inspect', '--type', 'container', '--format', '{{.Id}}', container],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10
+                ).returncode == 0
+            except (subprocess.TimeoutExpired, OSError):
+                found = False
+            if not found:
+                return compose_command('exec', '-T', 'mysql', *args)
+            self._mysql_containers[key] = container
+        return ['docker', 'exec', '-i', container, *args]
+
+    @contextmanager
+    def _open_database_file(self, file_path, logger=None):
+        """Open a database dump as a binary stream, decompressing gzipped files on the fly
+
+        The format is decided by peeking at the gzip magic bytes of the file we
+        are about to read, so detection costs no extra open(). Gzipped dumps are
+        inflated by igzip or pigz when one is installed (see _gunzip_pipe()),
+        otherwise by the gzip module.
+        """
+        if logger:
+            logger.log(f"📖 Reading database file: {Path(file_path).name}")
+
+        with open(file_path, 'rb') as raw:
+            is_gzipped = raw.peek(2)[:2] == b'\x1f\x8b'
+            gunzip = _gunzip_command() if is_gzipped else None
+
+            if logger:
+                if gunzip:
+                    logger.log(f"   📦 File type detected: Gzipped (decompressing with {Path(gunzip[0]).name})")
                 else:
-                    with open(file_path, 'rb') as f:
-                        content_bytes = f.read()
-                
-                # Try to decode as UTF-8 with replacement characters
-                try:
-                    content = content_bytes.decode('utf-8', errors='replace')
-                    if logger:
-                        logger.log(f"   ✅ Binary fallback successful with UTF-8 replacement")
-                    return content
-                except:
-                    # Final fallback: latin1 (maps all bytes 1:1)
-                    content = content_bytes.decode('latin1')
-                    if logger:
-                        logger.log(f"   ✅ Binary fallback successful with latin1 encoding")
-                    return content
-                    
-            except Exception as final_e:
-                raise Exception(f"Failed to read database file with all fallback methods. Last error: {str(final_e)}")
+                    logger.log(f"   📦 File type detected: {'Gzipped' if is_gzipped else 'Plain text'}")
+
+            if gunzip:
+                # peek() has read ahead on the descriptor the decompressor inherits;
+                # raw.seek(0) would only rewind within the buffer
+                os.lseek(raw.fileno(), 0, os.SEEK_SET)
+                with self._gunzip_pipe(gunzip, raw) as src:
+                    yield src
+            elif is_gzipped:
+                with gzip.GzipFile(fileobj=raw) as src:
+                    yield src
+            else:
+                yield raw
 
-    def _apply_url_replace(self, content, url_search, url_replace, logger):
+    @contextmanager
+    def _gunzip_pipe(self, gunzip, raw):
         """
-        Optionally replace URL strings in database content (e.g. production → local).
-        Uses literal string replace (all occurrences). No regex.
+        Yield the stdout of an external decompressor reading raw.
+
+        Inflating in a separate process runs in parallel with our own work on
+        the stream and needs no GIL. If the decompressor fails (a truncated or
+        corrupt dump), _DecompressError is raised when its output ends, just
+        as the gzip module would raise EOFError or BadGzipFile mid-stream.
         """
-        if not url_search or not url_replace:
-            return content
-        count = content.count(url_search)
-        if count == 0:
-            if logger:
+        proc = subprocess.Popen(gunzip, stdin=raw, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stream = _DecompressorStream(proc, Path(gunzip[0]).name)
+        try:
+            yield stream
+        finally:
+            # Closing stdout first stops a decompressor we stopped reading from (SIGPIPE)
+            proc.stdout.close()
+            stream.collect()
+            proc.stderr.close()
+        stream.check()
+
+    def _open_repaired_output(self, src, repaired_path):
+        """Open the repaired file for writing, gzipped exactly when the source dump is"""
+        if _is_decompressed(src):
+            return gzip.open(repaired_path, 'wb')
+        return open(repaired_path, 'wb')
+
+    def _iter_repaired(self, src, dst, stats, chunk_size=1 << 22):
+        """
+        Yield a dump opened with _open_database_file() with invalid UTF-8 and
+        control characters removed, writing each chunk to dst as well unless
+        dst is None.
+
+        Decoding is incremental, so multi-byte characters split across chunks
+        are handled; invalid bytes decode to U+FFFD, which _REPAIR_DELETE drops.
+        Uncompressed dumps are decoded straight from a read-only mmap, so the
+        page cache is the only copy of the raw bytes. The number of removed
+        characters is accumulated in stats['removed'].
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+        def clean(text):
+            cleaned = text.translate(_REPAIR_DELETE)
+            stats['removed'] += len(text) - len(cleaned)
+            data = cleaned.encode('utf-8')
+            if dst is not None:
+                dst.write(data)
+            return data
+
+        if not _is_decompressed(src) and os.fstat(src.fileno()).st_size:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as view:
+                    for pos in range(0, len(view), chunk_size):
+                        with view[pos:pos + chunk_size] as chunk:
+                            text = decoder.decode(chunk)
+                        yield clean(text)
+        else:
+            for chunk in iter(lambda: src.read(chunk_size), b''):
+                yield clean(decoder.decode(chunk))
+        yield clean(decoder.decode(b'', True))
+
+    def _iter_import_stream(self, src, logger=None, db_name=None, url_search=None, url_replace=None):
+        """
+        Yield the SQL to send to mysql for a dump opened with _open_database_file()
+        (or any other iterable of lines).
+
+        Rewrites INSERT to INSERT IGNORE, applies the optional literal URL
+        replacement and wraps the dump in _sql_preamble() / _SQL_EPILOGUE,
+        line by line on raw bytes so the dump is never held in memory or
+        decoded. mysqldump writes each statement on its own line(s), and
+        neither `INSERT INTO` nor a URL spans a line break.
+        """
+        search = replace = None
+        if url_search and url_replace:
+            search = url_search.encode('utf-8')
+            replace = url_replace.encode('utf-8')
+        replaced = 0
+
+        yield self._sql_preamble(logger, db_name).encode('utf-8')
+        for line in src:
+            line = _INSERT_INTO_RE.sub(b'INSERT IGNORE INTO ', line)
+            if search is not None and search in line:
+                replaced += line.count(search)
+                line = line.replace(search, replace)
+            yield line
+        yield _SQL_EPILOGUE.encode('utf-8')
+
+        if search is not None and logger:
+            if replaced:
+                logger.log(f"   🔄 URL replace: '{url_search}' → '{url_replace}' ({replaced:,} occurrence(s) replaced)")
+            else:
                 logger.log(f"   🔍 URL replace: '{url_search}' → '{url_replace}' (0 occurrences, no changes)")
-            return content
-        result = content.replace(url_search, url_replace)
-        if logger:
-            logger.log(f"   🔄 URL replace: '{url_search}' → '{url_replace}' ({count:,} occurrence(s) replaced)")
-        return result
 
-    def _wrap_sql_for_import(self, content, logger=None):
+    def _pipe_into_mysql(self, project_path, db_user, db_password, chunks, timeout=600):
         """
-        Wrap SQL dump with session settings and use INSERT IGNORE to avoid
-        duplicate-key errors during import (common with WordPress plugin tables
-        e.g. 404 detectors). unique_checks=0 does not reliably suppress 1062.
+        Feed an iterable of bytes into `mysql` inside the project's mysql container.
+
+        Returns (returncode, stderr). stderr is drained by a background thread
+        so a chatty mysql cannot block while we are still writing stdin, and
+        only its last _STDERR_TAIL_LINES lines are kept: a broken dump can make
+        mysql print millions of warnings.
+        Raises subprocess.TimeoutExpired if the import takes longer than timeout.
         """
-        # INSERT IGNORE skips rows that violate unique constraints (last one wins per key)
-        content = re.sub(r'\bINSERT\s+INTO\s+', 'INSERT IGNORE INTO ', content, flags=re.IGNORECASE)
-        preamble = (
+        proc = subprocess.Popen(
+            self._mysql_command(project_path,
+            'mysql', f'-u{db_user}', f'-p{db_password}'),
+            cwd=project_path, stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        err_tail = deque(maxlen=_STDERR_TAIL_LINES)
+        drain = threading.Thread(target=err_tail.extend, args=(proc.stderr,), daemon=True)
+        drain.start()
+
+        # A write blocks for as long as mysql is not reading (e.g. DROP DATABASE
+        # waiting on a metadata lock), so the dump is fed from a separate thread
+        # and the deadline is enforced here by waiting on mysql itself
+        feed_errors = []
+
+        def feed():
+            try:
+                for chunk in chunks:
+                    proc.stdin.write(chunk)
+                proc.stdin.close()
+            except BrokenPipeError:
+                # mysql exited early (or was killed); its stderr says why
+                pass
+            except BaseException as e:
+                # e.g. a corrupt gzip dump: stop mysql before it sees EOF
+                feed_errors.append(e)
+                proc.kill()
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            feeder.join(timeout=5)
+            drain.join(timeout=5)
+            # Closing under a still-blocked reader would wait for it
+            if not drain.is_alive():
+                proc.stderr.close()
+        if feed_errors:
+            raise feed_errors[0]
+        return returncode, b''.join(err_tail).decode('utf-8', errors='replace')
+
+    def _sql_preamble(self, logger=None, db_name=None):
+        """
+        Statements sent ahead of the dump.
+
+        When db_name is given, the database is dropped, recreated and selected
+        at the start of the stream, so clearing and importing share a single
+        mysql session and every fallback attempt starts from scratch.
+        """
+        preamble = ""
+        if db_name:
+            if logger:
+                logger.log(f"   🗑️  Database will be dropped and recreated before import")
+            preamble += (
+                f"DROP DATABASE IF EXISTS `{db_name}`;\n"
+                f"CREATE DATABASE `{db_name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;\n"
+                f"USE `{db_name}`;\n"
+            )
+        preamble += (
             "SET SESSION foreign_key_checks = 0;\n\n"
         )
-        epilogue = (
-            "\n\nSET SESSION foreign_key_checks = 1;\n"
-        )
-        return preamble + content + epilogue
+        return preamble
 
-    def import_database(self, project_path, project_name, db_file_path, backup_before_import=True, url_search=None, url_replace=None):
-        """Import database file with fallback strategy: try original first, then repaired version"""
+    def import_database(self, project_path, project_name, db_file_path, backup_before_import=True, url_search=None, url_replace=None, keep_repaired=False):
+        """
+        Import database file with fallback strategy: try original first, then repaired version.
+
+        A repaired copy is only written next to the dump when keep_repaired is set;
+        otherwise the cleaned SQL goes straight to mysql.
+        """
         if not project_path.exists():
             return {'success': False, 'error': 'Project not found', 'logs': []}
         
@@ -167,35 +395,27 @@ class DatabaseManager:
                 return {'success': False, 'error': f'Database file not found: {db_file_path}', 'logs': logger.get_logs()}
             
             # Read environment variables
-            env_file = project_path / '.env'
-            env_vars = {}
-            if env_file.exists():
-                try:
-                    with open(env_file, 'r') as f:
-                        for line in f:
-                            if '=' in line and not line.startswith('#'):
-                                key, value = line.strip().split('=', 1)
-                                env_vars[key] = value
-                except Exception as e:
-                    logger.log(f"Warning: Could not read .env file: {e}")
+            env_vars = load_env_file(project_path)
             
             db_name = env_vars.get('DB_NAME', f'local_{project_name}')
             db_user = env_vars.get('DB_USER', 'wordpress')
             db_password = env_vars.get('DB_PASSWORD', 'wordpress_password')
             
             # Backup current database if requested
+            backup_path = None
             if backup_before_import:
-                self._backup_database(project_path, project_name, db_name, db_user, db_password, logger)
-            
-            # Clear database before import to avoid duplicate key errors
-            self._clear_database(project_path, db_name, db_user, db_password, logger)
+                backup_path = self._backup_database(project_path, project_name, db_name, db_user, db_password, logger)
             
             # Implement fallback strategy: try original first, then repaired
             result = self._import_database_with_fallback(
                 project_path, db_file_path, db_name, db_user, db_password, logger,
-                url_search=url_search, url_replace=url_replace
+                url_search=url_search, url_replace=url_replace, keep_repaired=keep_repaired
             )
             
+            # A failed import may have replaced part of the database already
+            if not result['success'] and backup_path:
+                result['error'] += f' The previous database was backed up to data/{backup_path.name}.'
+            
             # Add captured logs to result
             result['logs'] = logger.get_logs()
             return result
@@ -205,43 +425,42 @@ class DatabaseManager:
             return {'success': False, 'error': str(e), 'logs': logger.get_logs()}
     
     def _backup_database(self, project_path, project_name, db_name, db_user, db_password, logger):
-        """Create a backup of the current database"""
+        """Create a backup of the current database, returning its path or None if it failed"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_filename = f"backup_before_import_{project_name}_{timestamp}.sql"
             backup_path = project_path / 'data' / backup_filename
             
             logger.log(f"🔄 Creating database backup...")
-            # Export current database (capture bytes; decode with replace to handle invalid UTF-8)
-            backup_result = subprocess.run(
-                compose_command('exec', '-T', 'mysql',
-                'mysqldump', f'-u{db_user}', f'-p{db_password}',
-                '--single-transaction', '--routines', '--triggers',
-                '--default-character-set=utf8mb4', db_name),
-                cwd=project_path, capture_output=True, timeout=600)
+            # Stream the dump straight into the backup file instead of buffering it in memory
+            with open(backup_path, 'wb') as f:
+                backup_result = subprocess.run(
+                    self._mysql_command(project_path,
+                    'mysqldump', f'-u{db_user}', f'-p{db_password}',
+                    '--single-transaction', '--routines', '--triggers',
+                    '--default-character-set=utf8mb4', db_name),
+                    cwd=project_path, stdout=f, stderr=subprocess.PIPE, timeout=600)
 
             if backup_result.returncode == 0:
-                out = backup_result.stdout.decode('utf-8', errors='replace')
-                with open(backup_path, 'w', encoding='utf-8', errors='replace') as f:
-                    f.write(out)
                 logger.log(f"✅ Database backed up to: {backup_path}")
+                return backup_path
             else:
                 err = backup_result.stderr.decode('utf-8', errors='replace')
                 logger.log(f"⚠️  Backup failed: {err}")
                 # Try alternative backup method for corrupted databases
                 logger.log(f"🔄 Attempting alternative backup method...")
-                backup_result = subprocess.run(
-                    compose_command('exec', '-T', 'mysql',
-                    'mysqldump', f'-u{db_user}', f'-p{db_password}',
-                    '--skip-extended-insert', '--skip-lock-tables', db_name),
-                    cwd=project_path, capture_output=True, timeout=600)
+                with open(backup_path, 'wb') as f:
+                    backup_result = subprocess.run(
+                        self._mysql_command(project_path,
+                        'mysqldump', f'-u{db_user}', f'-p{db_password}',
+                        '--skip-extended-insert', '--skip-lock-tables', db_name),
+                        cwd=project_path, stdout=f, stderr=subprocess.PIPE, timeout=600)
                 
                 if backup_result.returncode == 0:
-                    out = backup_result.stdout.decode('utf-8', errors='replace')
-                    with open(backup_path, 'w', encoding='utf-8', errors='replace') as f:
-                        f.write(out)
                     logger.log(f"✅ Alternative backup successful: {backup_path}")
+                    return backup_path
                 else:
+                    backup_path.unlink(missing_ok=True)
                     logger.log(f"❌ Both backup methods failed, skipping backup")
                     
         except subprocess.TimeoutExpired:
@@ -249,28 +468,7 @@ class DatabaseManager:
         except Exception as e:
             logger.log(f"❌ Backup failed but continuing with import: {e}")
     
-    def _clear_database(self, project_path, db_name, db_user, db_password, logger):
-        """Clear database before import to avoid conflicts"""
-        logger.log(f"🗑️  Clearing database to avoid conflicts...")
-        try:
-            # Drop and recreate database
-            clear_result = subprocess.run(
-                compose_command('exec', '-T', 'mysql',
-                'mysql', f'-u{db_user}', f'-p{db_password}',
-                '-e', f'DROP DATABASE IF EXISTS {db_name}; CREATE DATABASE {db_name} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;'),
-                cwd=project_path, capture_output=True, text=True, timeout=120)
-
-            if clear_result.returncode == 0:
-                logger.log(f"✅ Database cleared and recreated successfully")
-            else:
-                logger.log(f"⚠️  Database clear failed: {clear_result.stderr}")
-
-        except subprocess.TimeoutExpired:
-            logger.log("Operation timed out after 120s")
-        except Exception as e:
-            logger.log(f"⚠️  Failed to clear database: {e}")
-    
-    def _import_database_with_fallback(self, project_path, db_file_path, db_name, db_user, db_password, logger, url_search=None, url_replace=None):
+    def _import_database_with_fallback(self, project_path, db_file_path, db_name, db_user, db_password, logger, url_search=None, url_replace=None, keep_repaired=False):
         """Try importing database with fallback strategy"""
         db_file_path = Path(db_file_path)
         
@@ -314,22 +512,18 @@ class DatabaseManager:
             logger.log(f"📋 {attempt_msg}: Trying {file_type} file: {file_to_try.name}")
             
             try:
-                # Read database content (handles both plain and gzipped files)
-                db_content = self._read_database_file(file_to_try, logger)
-                db_content = self._apply_url_replace(db_content, url_search, url_replace, logger)
-                db_content = self._wrap_sql_for_import(db_content, logger)
-
-                # Import database
-                import_result = subprocess.run(
-                    compose_command('exec', '-T', 'mysql',
-                    'mysql', f'-u{db_user}', f'-p{db_password}', db_name),
-                    input=db_content, cwd=project_path, capture_output=True, text=True, timeout=600)
+                # Stream the dump (plain or gzipped) into mysql; the stream itself
+                # clears and selects the database
+                with self._open_database_file(file_to_try, logger) as src:
+                    returncode, stderr = self._pipe_into_mysql(
+                        project_path, db_user, db_password,
+                        self._iter_import_stream(src, logger, db_name, url_search, url_replace))
                 
-                if import_result.returncode == 0:
+                if returncode == 0:
                     logger.log(f"   ✅ Database imported successfully using {file_type} file: {file_to_try.name}")
                     return {'success': True, 'message': f'Database imported successfully using {file_type} file: {file_to_try.name}'}
                 else:
-                    error_msg = f'Database import failed with {file_type} file: {import_result.stderr}'
+                    error_msg = f'Database import failed with {file_type} file: {stderr}'
                     logger.log(f"   ❌ {error_msg}")
                     last_error = error_msg
                     
@@ -350,6 +544,14 @@ class DatabaseManager:
 
                 continue  # Try next file
 
+            except (_DecompressError, EOFError, gzip.BadGzipFile, zlib.error) as e:
+                # A broken archive cannot be repaired, and mysql has already run
+                # everything before the damaged part, so stop here
+                error_msg = (f'Could not decompress {file_to_try.name}: {e}. The import stopped there, '
+                             f'so the database may be partially imported')
+                logger.log(f"   ❌ {error_msg}")
+                return {'success': False, 'error': error_msg}
+
             except Exception as e:
                 error_msg = f'Error reading {file_type} file {file_to_try.name}: {str(e)}'
                 logger.log(f"   ❌ {error_msg}")
@@ -365,7 +567,7 @@ class DatabaseManager:
         if original_failed and len(files_to_try) == 1:
             return self._create_and_import_repaired_file(
                 project_path, db_file_path, db_name, db_user, db_password, logger,
-                url_search=url_search, url_replace=url_replace
+                url_search=url_search, url_replace=url_replace, keep_repaired=keep_repaired
             )
         
         # If all attempts failed
@@ -375,9 +577,14 @@ class DatabaseManager:
         else:
             return {'success': False, 'error': last_error or 'Database import failed'}
     
-    def _create_and_import_repaired_file(self, project_path, db_file_path, db_name, db_user, db_password, logger, url_search=None, url_replace=None):
-        """Create a repaired version of the database file and try importing it"""
-        logger.log(f"🔧 Original file failed, attempting to create and try repaired version...")
+    def _create_and_import_repaired_file(self, project_path, db_file_path, db_name, db_user, db_password, logger, url_search=None, url_replace=None, keep_repaired=False):
+        """
+        Repair the database file on the fly and try importing it.
+
+        The repaired dump is only saved to disk (gzipped like the original) when
+        keep_repaired is set; writing and recompressing it is otherwise wasted work.
+        """
+        logger.log(f"🔧 Original file failed, attempting to repair and import it...")
         
         try:
             # Create repaired filename
@@ -390,56 +597,39 @@ class DatabaseManager:
             
             repaired_path = db_file_path.parent / repaired_name
             
-            # Check if file is gzipped
-            is_gzipped = (
-                db_file_path.suffix.lower() == '.gz' or 
-                db_file_path.name.lower().endswith('.sql.gz') or
-                self._is_gzipped_file(db_file_path)
-            )
-            
-            logger.log(f"   🔧 Creating repaired file: {repaired_name}")
-            
-            # Read with error handling
-            if is_gzipped:
-                with gzip.open(db_file_path, 'rt', encoding='utf-8', errors='replace') as input_file:
-                    content = input_file.read()
-            else:
-                with open(db_file_path, 'r', encoding='utf-8', errors='replace') as input_file:
-                    content = input_file.read()
+            if keep_repaired:
+                logger.log(f"   🔧 Creating repaired file: {repaired_name}")
             
-            # Clean the content
-            original_length = len(content)
-            cleaned_content = content.replace('�', '')
-            cleaned_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', cleaned_content)
-            final_length = len(cleaned_content)
-            removed_chars = original_length - final_length
+            # Clean and import in a single pass: each cleaned chunk is streamed
+            # on to mysql and, if requested, written to the repaired file (kept
+            # without the import wrapper for manual retries)
+            stats = {'removed': 0}
+            try:
+                with self._open_database_file(db_file_path) as src, \
+                        (self._open_repaired_output(src, repaired_path) if keep_repaired else nullcontext()) as dst:
+                    repaired = self._iter_repaired(src, dst, stats)
+                    returncode, stderr = self._pipe_into_mysql(
+                        project_path, db_user, db_password,
+                        self._iter_import_stream(_iter_lines(repaired), logger, db_name, url_search, url_replace))
+                    # mysql may have stopped reading early; finish the repaired file anyway
+                    if dst is not None:
+                        for _ in repaired:
+                            pass
+            except BaseException:
+                # A partial repaired file would be picked up by later import attempts
+                if keep_repaired:
+                    repaired_path.unlink(missing_ok=True)
+                raise
             
+            removed_chars = stats['removed']
             logger.log(f"   ✂️  Removed {removed_chars:,} problematic characters")
-
-            cleaned_content = self._apply_url_replace(cleaned_content, url_search, url_replace, logger)
-            import_content = self._wrap_sql_for_import(cleaned_content, logger)
-            
-            # Write cleaned version (without wrapper; file is for manual retry)
-            if is_gzipped:
-                with gzip.open(repaired_path, 'wt', encoding='utf-8') as output_file:
-                    output_file.write(cleaned_content)
-            else:
-                with open(repaired_path, 'w', encoding='utf-8') as output_file:
-                    output_file.write(cleaned_content)
-            
-            logger.log(f"   ✅ Repaired file created, attempting import...")
-            
-            # Try importing the repaired file
-            import_result = subprocess.run(
-                compose_command('exec', '-T', 'mysql',
-                'mysql', f'-u{db_user}', f'-p{db_password}', db_name),
-                input=import_content, cwd=project_path, capture_output=True, text=True, timeout=600)
             
-            if import_result.returncode == 0:
-                logger.log(f"   ✅ Database imported successfully using repaired file: {repaired_name}")
-                return {'success': True, 'message': f'Database imported successfully using repaired file: {repaired_name} (removed {removed_chars:,} corrupted characters)'}
+            source = f"repaired file: {repaired_name}" if keep_repaired else f"repaired copy of {db_file_path.name}"
+            if returncode == 0:
+                logger.log(f"   ✅ Database imported successfully using {source}")
+                return {'success': True, 'message': f'Database imported successfully using {source} (removed {removed_chars:,} corrupted characters)'}
             else:
-                error_msg = f'Database import failed even with repaired file: {import_result.stderr}'
+                error_msg = f'Database import failed even with repaired file: {stderr}'
                 logger.log(f"   ❌ {error_msg}")
                 return {'success': False, 'error': error_msg}
                 
@@ -447,6 +637,6 @@ class DatabaseManager:
             logger.log("Operation timed out after 600s")
             return {'success': False, 'error': 'Database import timed out after 600s'}
         except Exception as e:
-            error_msg = f'Failed to create repaired file: {str(e)}'
+            error_msg = f'Failed to import repaired file: {str(e)}'
             logger.log(f"   ❌ {error_msg}")
             return {'success': False, 'error': error_msg}
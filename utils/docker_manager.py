@@ -1,45 +1,381 @@
+import os
+import shlex
 import subprocess
-import json
+import time
+from functools import lru_cache
 from pathlib import Path
 
+import yaml
+
 from .docker_compose_detect import compose_command
+from . import fast_json
+from .config_manager import load_env_file
+from .fs_utils import write_if_changed
+from .templating import ConfigTemplate
+
+# libyaml's C loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+# docker-compose.yml skeleton. `${lowercase}` slots are filled by _compose_template();
+# `${UPPERCASE}` references are left for Compose to resolve from the project's .env.
+_COMPOSE_TEMPLATE = ConfigTemplate("""services:
+  wordpress:
+    image: wordpress:${wp_image_tag}
+    container_name: ${PROJECT_NAME}_wordpress
+    restart: unless-stopped
+    environment:
+      WORDPRESS_DB_HOST: mysql
+      WORDPRESS_DB_USER: ${DB_USER}
+      WORDPRESS_DB_PASSWORD: ${DB_PASSWORD}
+      WORDPRESS_DB_NAME: ${DB_NAME}
+      WORDPRESS_DEBUG: 1
+      WORDPRESS_DEBUG_LOG: 1
+      WORDPRESS_DEBUG_DISPLAY: 0
+      WP_DEBUG_DISPLAY: 0
+      WP_DEBUG_LOG: 1
+    volumes:
+      - ./wp-content:/var/www/html/wp-content
+      - ./php-uploads.ini:/usr/local/etc/php/conf.d/uploads.ini
+      - ./php-fpm-pool.conf:/usr/local/etc/php-fpm.d/www.conf
+      - wordpress_data:/var/www/html
+    networks:
+      - wordpress_network
+    depends_on:
+      - mysql
+
+  wpcli:
+    image: wordpress:cli-php8.3
+    container_name: ${PROJECT_NAME}_wpcli
+    environment:
+      WORDPRESS_DB_HOST: mysql
+      WORDPRESS_DB_USER: ${DB_USER}
+      WORDPRESS_DB_PASSWORD: ${DB_PASSWORD}
+      WORDPRESS_DB_NAME: ${DB_NAME}
+    volumes:
+      - ./wp-content:/var/www/html/wp-content
+      - wordpress_data:/var/www/html
+    networks:
+      - wordpress_network
+    depends_on:
+      - wordpress
+      - mysql
+    profiles:
+      - cli
+    working_dir: /var/www/html
+    user: "33:33"
+    entrypoint: wp
+    command: --info
+
+  mysql:
+    image: mysql:8.0
+    container_name: ${PROJECT_NAME}_mysql
+    restart: unless-stopped
+    environment:
+      MYSQL_DATABASE: ${DB_NAME}
+      MYSQL_USER: ${DB_USER}
+      MYSQL_PASSWORD: ${DB_PASSWORD}
+      MYSQL_ROOT_PASSWORD: ${DB_ROOT_PASSWORD}
+    volumes:
+      - mysql_data:/var/lib/mysql
+      - ./data:/docker-entrypoint-initdb.d
+    ports:
+      - "${MYSQL_PORT}:3306"
+    healthcheck:
+      test: ["CMD-SHELL", "mysqladmin ping -h 127.0.0.1 -uroot -p$$MYSQL_ROOT_PASSWORD --silent"]
+      interval: 3s
+      timeout: 5s
+      retries: 40
+      start_period: 5s
+    networks:
+      - wordpress_network
+
+  phpmyadmin:
+    image: phpmyadmin:latest
+    container_name: ${PROJECT_NAME}_phpmyadmin
+    restart: unless-stopped
+    environment:
+      PMA_HOST: mysql
+      PMA_USER: ${DB_USER}
+      PMA_PASSWORD: ${DB_PASSWORD}
+      UPLOAD_LIMIT: 100M
+    volumes:
+      - ./php-uploads.ini:/usr/local/etc/php/conf.d/uploads.ini
+    ports:
+      - "${PHPMYADMIN_PORT}:80"
+    networks:
+      - wordpress_network
+    depends_on:
+      - mysql
+
+  nginx:
+    image: nginx:alpine
+    container_name: ${PROJECT_NAME}_nginx
+    restart: unless-stopped
+    ports:
+      - "${HTTP_PORT}:80"
+      - "${HTTPS_PORT}:443"
+    volumes:
+${nginx_volumes_str}
+    networks:
+      - wordpress_network
+    depends_on:
+${nginx_depends_str}${redis_service}
+
+volumes:
+${volumes_str}
+
+networks:
+  wordpress_network:
+    driver: bridge
+""")
+
+
+# Per-project .env read by Compose to resolve the ${VAR} references above
+_ENV_TEMPLATE = """PROJECT_NAME=%(project_name)s
+DB_NAME=local_%(project_name)s
+DB_USER=wordpress
+DB_PASSWORD=wordpress_password
+DB_ROOT_PASSWORD=root_password
+HTTP_PORT=%(http_port)s
+HTTPS_PORT=%(https_port)s
+MYSQL_PORT=%(mysql_port)s
+PHPMYADMIN_PORT=%(phpmyadmin_port)s
+REDIS_PORT=%(redis_port)s
+DOMAIN=%(domain)s
+"""
+
+# Fragments that only depend on enable_ssl / enable_redis, spliced into _COMPOSE_TEMPLATE
+_NGINX_VOLUMES = {
+    False: (
+        "      - ./nginx.conf:/etc/nginx/conf.d/default.conf\n"
+        "      - ./wp-content:/var/www/html/wp-content\n"
+        "      - wordpress_data:/var/www/html"
+    ),
+    True: (
+        "      - ./nginx.conf:/etc/nginx/conf.d/default.conf\n"
+        "      - ./wp-content:/var/www/html/wp-content\n"
+        "      - wordpress_data:/var/www/html\n"
+        "      - ./ssl:/etc/nginx/ssl"
+    ),
+}
+
+_REDIS_SERVICE = """
+  redis:
+    image: redis:7-alpine
+    container_name: ${PROJECT_NAME}_redis
+    restart: unless-stopped
+    ports:
+      - "${REDIS_PORT}:6379"
+    volumes:
+      - redis_data:/data
+    networks:
+      - wordpress_network"""
+
+_NGINX_DEPENDS = {
+    False: "      - wordpress",
+    True: "      - wordpress\n      - redis",
+}
+
+_COMPOSE_VOLUMES = {
+    False: "  wordpress_data:\n  mysql_data:",
+    True: "  wordpress_data:\n  mysql_data:\n  redis_data:",
+}
+
+
+# Static PHP settings mounted into the wordpress container, pre-encoded
+_PHP_UPLOADS_INI = b"""; PHP Upload Configuration
+; Increase file upload limits for WordPress development
+
+; Maximum file size for uploads
+upload_max_filesize = 100M
+
+; Maximum size of POST data
+post_max_size = 100M
+
+; Maximum number of files that can be uploaded
+max_file_uploads = 20
+
+; Maximum execution time for scripts (in seconds)
+max_execution_time = 300
+
+; Maximum amount of memory a script may consume
+memory_limit = 256M
+
+; Maximum input variables
+max_input_vars = 3000
+
+; Maximum time to parse input data
+max_input_time = 300
+"""
+
+_PHP_FPM_POOL_CONF = b"""; PHP-FPM Pool Configuration
+; Override default pool settings to increase max_children for better performance
+
+[www]
+; User and group for PHP-FPM processes (required)
+user = www-data
+group = www-data
+
+; Maximum number of child processes
+pm.max_children = 20
+
+; Number of child processes created on startup
+pm.start_servers = 5
+
+; Minimum number of idle server processes
+pm.min_spare_servers = 3
+
+; Maximum number of idle server processes
+pm.max_spare_servers = 8
+
+; Maximum number of requests each child process should execute before respawning
+pm.max_requests = 500
+
+; Process manager style (static, dynamic, or ondemand)
+pm = dynamic
+"""
+
+
+@lru_cache(maxsize=32)
+def _compose_template(wordpress_version, enable_ssl, enable_redis):
+    """Build the docker-compose.yml body for a given service signature.
+
+    Everything project-specific (name, ports, DB credentials) is referenced
+    through ``${VAR}`` placeholders that Compose resolves from ``.env``, so
+    the output only depends on these three arguments and can be cached.
+    The result is cached already UTF-8 encoded, ready to be written out.
+    """
+    # Normalize WordPress version for FPM image
+    # Handle versions that already include -fpm, or are "latest", or are just version numbers
+    if wordpress_version.endswith('-fpm'):
+        # Version already includes -fpm, use as-is
+        wp_image_tag = wordpress_version
+    elif wordpress_version == 'latest':
+        # Latest should use fpm tag (which is latest FPM)
+        wp_image_tag = 'fpm'
+    elif wordpress_version.startswith('php'):
+        # PHP version like php8.3, add -fpm
+        wp_image_tag = f"{wordpress_version}-fpm"
+    else:
+        # Version number like 6.4, add -fpm
+        wp_image_tag = f"{wordpress_version}-fpm"
+
+    return _COMPOSE_TEMPLATE.substitute({
+        'wp_image_tag': wp_image_tag,
+        'nginx_volumes_str': _NGINX_VOLUMES[bool(enable_ssl)],
+        'nginx_depends_str': _NGINX_DEPENDS[bool(enable_redis)],
+        'redis_service': _REDIS_SERVICE if enable_redis else "",
+        'volumes_str': _COMPOSE_VOLUMES[bool(enable_redis)],
+    }).encode('utf-8')
 
 
 class DockerManager:
     """Handles Docker container operations and docker-compose configuration"""
     
+    # Seconds a project status stays valid. The dashboard polls the project
+    # list, and each miss costs a Docker CLI round trip per project.
+    STATUS_CACHE_TTL = 2.0
+    
     def __init__(self):
-        pass
+        # Compose project name -> (time.monotonic() when stored, status dict)
+        self._status_cache = {}
+        # docker-compose.yml path -> (st_mtime_ns, st_size, parsed document)
+        self._compose_cache = {}
+    
+    def invalidate_status(self, project_path=None):
+        """Forget cached status for one project, or for all projects
+
+        Called after anything that starts, stops or restarts containers so the
+        next status check reflects the change immediately.
+        """
+        if project_path is None:
+            self._status_cache.clear()
+        else:
+            self._status_cache.pop(project_path.name.lower(), None)
     
-    def get_project_status(self, project_path):
-        """Get the status of Docker containers for a project"""
+    def get_all_project_containers(self, project=None):
+        """Get containers of every Compose project with a single `docker ps` call
+
+        Returns a dict mapping the Compose project name (the lowercased project
+        directory name) to its list of containers, or None if Docker could not
+        be queried. Pass `project` to only list that project's containers.
+        """
+        label = 'com.docker.compose.project'
+        if project is not None:
+            label = f'{label}={project}'
+        try:
+            result = subprocess.run(
+                ['docker', 'ps', '-a', '--no-trunc',
+                 '--filter', f'label={label}',
+                 '--format', '{{.Label "com.docker.compose.project"}}\t{{json .}}'],
+                capture_output=True,
+                timeout=30
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+
+        if result.returncode != 0:
+            return None
+
+        projects = {}
+        for line in result.stdout.splitlines():
+            project, sep, container = line.partition(b'\t')
+            if sep and container.strip():
+                projects.setdefault(project.decode('utf-8', 'replace'), []).append(fast_json.loads(container))
+        return projects
+
+    def _summarize_containers(self, containers):
+        """Turn a list of containers into a project status dict"""
+        running_containers = [c for c in containers if c.get('State') == 'running']
+
+        if not running_containers:
+            return {'status': 'stopped', 'containers': containers}
+        elif len(running_containers) == len(containers):
+            return {'status': 'running', 'containers': containers}
+        else:
+            return {'status': 'partial', 'containers': containers}
+
+    def get_project_status(self, project_path, _prefetched=None, fresh=False):
+        """Get the status of Docker containers for a project
+
+        `_prefetched` is the mapping returned by get_all_project_containers();
+        when given, no Docker command is run for this project. Results are
+        cached for STATUS_CACHE_TTL seconds; pass fresh=True where the answer
+        decides whether to start or recreate containers, since Compose calls
+        made outside this class (or by the user) do not invalidate the cache.
+        """
         if not project_path.exists():
             return {'status': 'not_found'}
+
+        compose_project = project_path.name.lower()
+        if _prefetched is None:
+            cached = None if fresh else self._status_cache.get(compose_project)
+            if cached is not None and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+                return dict(cached[1])
+
+            # A label-filtered `docker ps` talks to the daemon directly, without
+            # Compose having to load and interpolate the project files
+            _prefetched = self.get_all_project_containers(project=compose_project)
+
+        if _prefetched is not None:
+            status = self._summarize_containers(_prefetched.get(compose_project, []))
+            self._status_cache[compose_project] = (time.monotonic(), status)
+            return dict(status)
         
+        # Fall back to Compose if `docker ps` could not be run
         try:
+            # Keep stdout as bytes: fast_json.loads accepts bytes directly, so
+            # there is no need to decode the whole output first.
             result = subprocess.run(
                 compose_command('ps', '--format', 'json'),
                 cwd=project_path,
                 capture_output=True,
-                text=True,
                 timeout=30
             )
 
             if result.returncode == 0:
-                containers = []
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        containers.append(json.loads(line))
-
-                running_containers = [c for c in containers if c.get('State') == 'running']
-                total_containers = len(containers)
-
-                if total_containers == 0:
-                    return {'status': 'stopped', 'containers': []}
-                elif len(running_containers) == total_containers:
-                    return {'status': 'running', 'containers': containers}
-                else:
-                    return {'status': 'partial', 'containers': containers}
+                return self._summarize_containers(fast_json.loads_lines(result.stdout, skip_invalid=True))
             else:
                 return {'status': 'stopped', 'containers': []}
 
@@ -48,19 +384,26 @@ class DockerManager:
         except Exception as e:
             return {'status': 'error', 'error': str(e)}
     
-    def start_project(self, project_path):
-        """Start Docker containers for a project"""
+    def start_project(self, project_path, recreate=False):
+        """Start Docker containers for a project
+
+        With recreate=True every container is recreated in the same `up` call
+        (and orphans left by removed services are dropped), which replaces a
+        separate `down` when configuration changed under running containers.
+        """
         if not project_path.exists():
             return {'success': False, 'error': 'Project not found'}
         
+        up_args = ('up', '-d', '--force-recreate', '--remove-orphans') if recreate else ('up', '-d')
         try:
             result = subprocess.run(
-                compose_command('up', '-d'),
+                compose_command(*up_args),
                 cwd=project_path,
                 capture_output=True,
                 text=True,
                 timeout=120
             )
+            self.invalidate_status(project_path)
 
             if result.returncode == 0:
                 # Verify containers actually started
@@ -110,6 +453,7 @@ class DockerManager:
                 text=True,
                 timeout=120
             )
+            self.invalidate_status(project_path)
 
             if result.returncode == 0:
                 return {'success': True, 'message': 'Project stopped successfully'}
@@ -122,41 +466,60 @@ class DockerManager:
             return {'success': False, 'error': str(e)}
     
     def restart_project(self, project_path):
-        """Restart Docker containers for a project"""
-        if not project_path.exists():
-            return {'success': False, 'error': 'Project not found'}
+        """Restart Docker containers for a project
+
+        A single `up -d --force-recreate` instead of `down` + `up -d`: each
+        container is replaced in place, and the project network and volumes
+        are kept, so there is no full teardown and only one Compose call.
+        """
+        result = self.start_project(project_path, recreate=True)
+        if result['success']:
+            result['message'] = 'Project restarted successfully'
+        return result
+    
+    def wait_for_mysql(self, project_path, timeout=60, interval=0.25):
+        """Wait until the project's MySQL server accepts connections
+
+        Uses the container healthcheck when the compose file defines one and
+        falls back to pinging mysqld through `compose exec` for projects created
+        before the healthcheck existed. Returns True once MySQL is ready, False
+        if it is still not ready after `timeout` seconds.
+        """
+        env_vars = load_env_file(project_path)
+        container = self.container_name(project_path, 'mysql')
+        root_password = env_vars.get('DB_ROOT_PASSWORD', 'root_password')
+        deadline = time.monotonic() + timeout
+        use_healthcheck = True
         
-        try:
-            # Stop first
-            stop_result = subprocess.run(
-                compose_command('down'),
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-
-            if stop_result.returncode != 0:
-                return {'success': False, 'error': f'Failed to stop containers: {stop_result.stderr}'}
-
-            # Then start
-            start_result = subprocess.run(
-                compose_command('up', '-d'),
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-
-            if start_result.returncode == 0:
-                return {'success': True, 'message': 'Project restarted successfully'}
-            else:
-                return {'success': False, 'error': f'Failed to start containers: {start_result.stderr}'}
-
-        except subprocess.TimeoutExpired:
-            return {'success': False, 'error': 'Operation timed out. Check Docker status.'}
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        while True:
+            try:
+                if use_healthcheck:
+                    result = subprocess.run(
+                        ['docker', 'inspect', '--format',
+                         '{{if .State.Health}}{{.State.Health.Status}}{{end}}', container],
+                        capture_output=True, timeout=10
+                    )
+                    status = result.stdout.strip()
+                    if status == b'healthy':
+                        return True
+                    if result.returncode == 0 and not status:
+                        # No healthcheck defined for this container
+                        use_healthcheck = False
+                        continue
+                else:
+                    result = subprocess.run(
+                        compose_command('exec', '-T', 'mysql', 'sh', '-c',
+                                        f'MYSQL_PWD={root_password} mysqladmin ping -h 127.0.0.1 -uroot --silent'),
+                        cwd=project_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10
+                    )
+                    if result.returncode == 0:
+                        return True
+            except (subprocess.TimeoutExpired, OSError, RuntimeError):
+                pass
+            
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
     
     def restart_container(self, project_path, container_name):
         """Restart a specific container in a project"""
@@ -171,6 +534,7 @@ class DockerManager:
                 text=True,
                 timeout=120
             )
+            self.invalidate_status(project_path)
 
             if result.returncode == 0:
                 return {'success': True, 'message': f'Container {container_name} restarted successfully'}
@@ -192,178 +556,65 @@ class DockerManager:
                 compose_command('logs', f'--tail={tail_lines}'),
                 cwd=project_path,
                 capture_output=True,
-                text=True,
                 timeout=30
             )
-            return result.stdout
+            return result.stdout.decode('utf-8', 'replace')
         except subprocess.TimeoutExpired:
             return "Error: log fetch timed out"
         except Exception as e:
             return f"Error getting logs: {str(e)}"
     
-    def create_docker_compose(self, project_path, project_name, wordpress_version, domain, enable_ssl, enable_redis, ports=None):
-        """Create docker-compose.yml for the project"""
-        
-        # Create custom PHP configuration for file uploads
-        self._create_php_config(project_path)
-        
-        # Normalize WordPress version for FPM image
-        # Handle versions that already include -fpm, or are "latest", or are just version numbers
-        if wordpress_version.endswith('-fpm'):
-            # Version already includes -fpm, use as-is
-            wp_image_tag = wordpress_version
-        elif wordpress_version == 'latest':
-            # Latest should use fpm tag (which is latest FPM)
-            wp_image_tag = 'fpm'
-        elif wordpress_version.startswith('php'):
-            # PHP version like php8.3, add -fpm
-            wp_image_tag = f"{wordpress_version}-fpm"
-        else:
-            # Version number like 6.4, add -fpm
-            wp_image_tag = f"{wordpress_version}-fpm"
+    def stream_project_logs(self, project_path, tail_lines=100, follow=True):
+        """Yield log lines for Docker containers as Compose produces them
+
+        Unlike get_project_logs this does not wait for the whole output, so a
+        caller can forward each line immediately. With follow=True the
+        generator runs until the consumer closes it, which stops `compose logs`.
+        """
+        if not project_path.exists():
+            yield "Project not found"
+            return
         
-        # Build nginx volumes list
-        nginx_volumes = [
-            "./nginx.conf:/etc/nginx/conf.d/default.conf",
-            "./wp-content:/var/www/html/wp-content",
-            "wordpress_data:/var/www/html"
-        ]
-        if enable_ssl:
-            nginx_volumes.append("./ssl:/etc/nginx/ssl")
-        nginx_volumes_str = "\n".join([f"      - {vol}" for vol in nginx_volumes])
+        args = ['logs', f'--tail={tail_lines}']
+        if follow:
+            args.append('--follow')
         
-        # Build nginx depends_on list
-        nginx_depends = ["wordpress"]
-        if enable_redis:
-            nginx_depends.append("redis")
-        nginx_depends_str = "\n".join([f"      - {dep}" for dep in nginx_depends])
+        try:
+            process = subprocess.Popen(
+                compose_command(*args),
+                cwd=project_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+        except Exception as e:
+            yield f"Error getting logs: {str(e)}"
+            return
         
-        # Redis service
-        redis_service = """
-  redis:
-    image: redis:7-alpine
-    container_name: ${PROJECT_NAME}_redis
-    restart: unless-stopped
-    ports:
-      - "${REDIS_PORT}:6379"
-    volumes:
-      - redis_data:/data
-    networks:
-      - wordpress_network""" if enable_redis else ""
+        try:
+            for line in process.stdout:
+                yield line.decode('utf-8', 'replace').rstrip('\r\n')
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            process.stdout.close()
+    
+    def create_docker_compose(self, project_path, project_name, wordpress_version, domain, enable_ssl, enable_redis, ports=None):
+        """Create docker-compose.yml for the project
+
+        Returns True if any of the generated files (docker-compose.yml, .env,
+        PHP config) changed, i.e. if running containers need recreating.
+        """
         
-        # Build volumes list
-        volumes_list = ["wordpress_data:", "mysql_data:"]
-        if enable_redis:
-            volumes_list.append("redis_data:")
-        volumes_str = "\n".join([f"  {vol}" for vol in volumes_list])
+        # Create custom PHP configuration for file uploads
+        changed = self._create_php_config(project_path)
         
-        compose_content = f"""services:
-  wordpress:
-    image: wordpress:{wp_image_tag}
-    container_name: ${{PROJECT_NAME}}_wordpress
-    restart: unless-stopped
-    environment:
-      WORDPRESS_DB_HOST: mysql
-      WORDPRESS_DB_USER: ${{DB_USER}}
-      WORDPRESS_DB_PASSWORD: ${{DB_PASSWORD}}
-      WORDPRESS_DB_NAME: ${{DB_NAME}}
-      WORDPRESS_DEBUG: 1
-      WORDPRESS_DEBUG_LOG: 1
-      WORDPRESS_DEBUG_DISPLAY: 0
-      WP_DEBUG_DISPLAY: 0
-      WP_DEBUG_LOG: 1
-    volumes:
-      - ./wp-content:/var/www/html/wp-content
-      - ./php-uploads.ini:/usr/local/etc/php/conf.d/uploads.ini
-      - ./php-fpm-pool.conf:/usr/local/etc/php-fpm.d/www.conf
-      - wordpress_data:/var/www/html
-    networks:
-      - wordpress_network
-    depends_on:
-      - mysql
+        compose_content = _compose_template(wordpress_version, enable_ssl, enable_redis)
 
-  wpcli:
-    image: wordpress:cli-php8.3
-    container_name: ${{PROJECT_NAME}}_wpcli
-    environment:
-      WORDPRESS_DB_HOST: mysql
-      WORDPRESS_DB_USER: ${{DB_USER}}
-      WORDPRESS_DB_PASSWORD: ${{DB_PASSWORD}}
-      WORDPRESS_DB_NAME: ${{DB_NAME}}
-    volumes:
-      - ./wp-content:/var/www/html/wp-content
-      - wordpress_data:/var/www/html
-    networks:
-      - wordpress_network
-    depends_on:
-      - wordpress
-      - mysql
-    profiles:
-      - cli
-    working_dir: /var/www/html
-    user: "33:33"
-    entrypoint: wp
-    command: --info
-
-  mysql:
-    image: mysql:8.0
-    container_name: ${{PROJECT_NAME}}_mysql
-    restart: unless-stopped
-    environment:
-      MYSQL_DATABASE: ${{DB_NAME}}
-      MYSQL_USER: ${{DB_USER}}
-      MYSQL_PASSWORD: ${{DB_PASSWORD}}
-      MYSQL_ROOT_PASSWORD: ${{DB_ROOT_PASSWORD}}
-    volumes:
-      - mysql_data:/var/lib/mysql
-      - ./data:/docker-entrypoint-initdb.d
-    ports:
-      - "${{MYSQL_PORT}}:3306"
-    networks:
-      - wordpress_network
-
-  phpmyadmin:
-    image: phpmyadmin:latest
-    container_name: ${{PROJECT_NAME}}_phpmyadmin
-    restart: unless-stopped
-    environment:
-      PMA_HOST: mysql
-      PMA_USER: ${{DB_USER}}
-      PMA_PASSWORD: ${{DB_PASSWORD}}
-      UPLOAD_LIMIT: 100M
-    volumes:
-      - ./php-uploads.ini:/usr/local/etc/php/conf.d/uploads.ini
-    ports:
-      - "${{PHPMYADMIN_PORT}}:80"
-    networks:
-      - wordpress_network
-    depends_on:
-      - mysql
-
-  nginx:
-    image: nginx:alpine
-    container_name: ${{PROJECT_NAME}}_nginx
-    restart: unless-stopped
-    ports:
-      - "${{HTTP_PORT}}:80"
-      - "${{HTTPS_PORT}}:443"
-    volumes:
-{nginx_volumes_str}
-    networks:
-      - wordpress_network
-    depends_on:
-{nginx_depends_str}{redis_service}
-
-volumes:
-{volumes_str}
-
-networks:
-  wordpress_network:
-    driver: bridge
-"""
-        
-        with open(project_path / "docker-compose.yml", 'w') as f:
-            f.write(compose_content)
+        changed |= write_if_changed(project_path / "docker-compose.yml", compose_content)
         
         # Create .env file
         http_port = ports['HTTP_PORT'] if ports else 80
@@ -372,82 +623,25 @@ networks:
         phpmyadmin_port = ports['PHPMYADMIN_PORT'] if ports else 8080
         redis_port = ports['REDIS_PORT'] if ports else 6379
 
-        env_content = f"""PROJECT_NAME={project_name}
-DB_NAME=local_{project_name}
-DB_USER=wordpress
-DB_PASSWORD=wordpress_password
-DB_ROOT_PASSWORD=root_password
-HTTP_PORT={http_port}
-HTTPS_PORT={https_port}
-MYSQL_PORT={mysql_port}
-PHPMYADMIN_PORT={phpmyadmin_port}
-REDIS_PORT={redis_port}
-DOMAIN={domain.split('/')[0]}
-"""
+        env_content = _ENV_TEMPLATE % {
+            'project_name': project_name,
+            'http_port': http_port,
+            'https_port': https_port,
+            'mysql_port': mysql_port,
+            'phpmyadmin_port': phpmyadmin_port,
+            'redis_port': redis_port,
+            'domain': domain.split('/')[0],
+        }
         
-        with open(project_path / ".env", 'w') as f:
-            f.write(env_content)
+        changed |= write_if_changed(project_path / ".env", env_content)
+        return changed
     
     def _create_php_config(self, project_path):
         """Create custom PHP configuration for file uploads and PHP-FPM pool settings"""
-        php_config = """; PHP Upload Configuration
-; Increase file upload limits for WordPress development
-
-; Maximum file size for uploads
-upload_max_filesize = 100M
-
-; Maximum size of POST data
-post_max_size = 100M
-
-; Maximum number of files that can be uploaded
-max_file_uploads = 20
-
-; Maximum execution time for scripts (in seconds)
-max_execution_time = 300
-
-; Maximum amount of memory a script may consume
-memory_limit = 256M
-
-; Maximum input variables
-max_input_vars = 3000
-
-; Maximum time to parse input data
-max_input_time = 300
-"""
-        
-        with open(project_path / "php-uploads.ini", 'w') as f:
-            f.write(php_config)
-        
-        # Create PHP-FPM pool configuration
-        php_fpm_pool_config = """; PHP-FPM Pool Configuration
-; Override default pool settings to increase max_children for better performance
-
-[www]
-; User and group for PHP-FPM processes (required)
-user = www-data
-group = www-data
-
-; Maximum number of child processes
-pm.max_children = 20
-
-; Number of child processes created on startup
-pm.start_servers = 5
-
-; Minimum number of idle server processes
-pm.min_spare_servers = 3
-
-; Maximum number of idle server processes
-pm.max_spare_servers = 8
-
-; Maximum number of requests each child process should execute before respawning
-pm.max_requests = 500
-
-; Process manager style (static, dynamic, or ondemand)
-pm = dynamic
-"""
-        
-        with open(project_path / "php-fpm-pool.conf", 'w') as f:
-            f.write(php_fpm_pool_config)
+        # Bind-mounted as single files, so rewritten in place rather than replaced
+        changed = write_if_changed(project_path / "php-uploads.ini", _PHP_UPLOADS_INI, atomic=False)
+        changed |= write_if_changed(project_path / "php-fpm-pool.conf", _PHP_FPM_POOL_CONF, atomic=False)
+        return changed
     
     def get_container_id(self, project_path, service_name):
         """Get the container ID for a docker-compose service. Returns None if not found."""
@@ -483,21 +677,39 @@ pm = dynamic
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
-    def exec_command_in_container(self, project_path, container_name, command):
-        """Execute a command in a specific container"""
+    def container_name(self, project_path, service_name):
+        """Name of a service's container, as set by `container_name` in docker-compose.yml"""
+        env_vars = load_env_file(project_path)
+        return f"{env_vars.get('PROJECT_NAME', project_path.name)}_{service_name}"
+
+    def exec_command_in_container(self, project_path, container_name, command, input=None):
+        """Execute a command in a specific container
+
+        Runs `docker exec` against the container directly, which skips loading
+        the compose project on every call. Falls back to `compose exec` when
+        the container is not found under its expected name. `input` (bytes),
+        if given, is sent to the command's stdin.
+        """
+        interactive = ['-i'] if input is not None else []
         try:
-            cmd = compose_command('exec', '-T', container_name) + command
             result = subprocess.run(
-                cmd,
-                cwd=project_path,
+                ['docker', 'exec', *interactive, self.container_name(project_path, container_name)] + command,
+                input=input,
                 capture_output=True,
-                text=True,
                 timeout=120
             )
+            if result.returncode != 0 and b'No such container' in result.stderr:
+                result = subprocess.run(
+                    compose_command('exec', '-T', container_name) + command,
+                    cwd=project_path,
+                    input=input,
+                    capture_output=True,
+                    timeout=120
+                )
             return {
                 'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr,
+                'output': result.stdout.decode('utf-8', 'replace'),
+                'error': result.stderr.decode('utf-8', 'replace'),
                 'returncode': result.returncode
             }
         except subprocess.TimeoutExpired:
@@ -513,33 +725,61 @@ pm = dynamic
                 'returncode': -1
             }
     
+    def load_compose(self, project_path):
+        """Parse the project's docker-compose.yml
+
+        The parsed document is cached until the file's mtime or size changes,
+        so callers must not modify it. Raises FileNotFoundError if the project
+        has no docker-compose.yml and yaml.YAMLError if it cannot be parsed.
+        """
+        docker_compose_path = os.path.join(project_path, "docker-compose.yml")
+        st = os.stat(docker_compose_path)
+        cached = self._compose_cache.get(docker_compose_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        with open(docker_compose_path, 'rb') as f:
+            compose = yaml.load(f, Loader=_YamlLoader) or {}
+        self._compose_cache[docker_compose_path] = (st.st_mtime_ns, st.st_size, compose)
+        return compose
+    
+    def compose_has_service(self, project_path, service_name):
+        """Check whether the project's docker-compose.yml defines a service
+
+        Checks the `services` mapping of the parsed file (see load_compose()),
+        so names in comments or other keys do not count. Raises
+        FileNotFoundError if the project has no docker-compose.yml.
+        """
+        services = self.load_compose(project_path).get('services') or {}
+        return service_name in services
+    
     def run_wp_cli_command(self, project_path, command):
         """Run a WP CLI command using the wpcli container"""
         try:
-            import shlex
-            
             # Check if WP CLI service exists in docker-compose
-            docker_compose_path = project_path / "docker-compose.yml"
-            if not docker_compose_path.exists():
+            try:
+                has_wpcli = self.compose_has_service(project_path, 'wpcli')
+            except FileNotFoundError:
                 return {'success': False, 'error': 'docker-compose.yml not found'}
             
-            with open(docker_compose_path, 'r') as f:
-                compose_content = f.read()
-            
-            if "wpcli:" not in compose_content:
+            if not has_wpcli:
                 return {'success': False, 'error': 'WP CLI service not configured. Please add WP CLI to this project first.'}
             
             # Run the WP CLI command - use shlex.split to properly handle quoted arguments
             cmd = compose_command('--profile', 'cli', 'run', '--rm', 'wpcli')
             cmd.extend(shlex.split(command))
 
-            result = subprocess.run(
-                cmd,
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            try:
+                result = subprocess.run(
+                    cmd,
+                    cwd=project_path,
+                    capture_output=True,
+                    text=True,
+                    timeout=120
+                )
+            finally:
+                # `run` may have started the services wpcli depends on
+                self.invalidate_status(project_path)
 
             return {
                 'success': result.returncode == 0,
@@ -556,14 +796,10 @@ pm = dynamic
     
     def has_wpcli_service(self, project_path):
         """Check if project has WP CLI service configured"""
-        docker_compose_path = project_path / "docker-compose.yml"
-        if not docker_compose_path.exists():
-            return False
-        
         try:
-            with open(docker_compose_path, 'r') as f:
-                compose_content = f.read()
-            return "wpcli:" in compose_content
+            return self.compose_has_service(project_path, 'wpcli')
+        except FileNotFoundError:
+            return False
         except Exception as e:
             print(f"Warning: could not read docker-compose.yml: {e}")
             return False
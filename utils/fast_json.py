@@ -0,0 +1,79 @@
+"""JSON helpers backed by orjson when it is installed.
+
+orjson parses the many small documents produced by ``docker ps`` /
+``docker compose ps`` and the per-project ``config.json`` files noticeably
+faster than the standard library.  It is an optional dependency: without it
+these helpers fall back to :mod:`json` with the same behaviour.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+__all__ = [
+    "loads",
+    "loads_lines",
+    "dumps",
+    "JSONDecodeError",
+]
+
+JSONDecodeError = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
+
+
+def loads(data):
+    """Parse JSON from ``bytes`` or ``str``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_lines(data, skip_invalid: bool = False) -> list:
+    """Parse ``docker ... --format json`` output into a list with one parse.
+
+    Accepts newline-delimited JSON objects (what Compose >= 2.21 prints) as
+    well as a single JSON array (older Compose v2).  Blank lines are ignored.
+    With ``skip_invalid=True`` output that does not parse as a whole (e.g. a
+    warning printed to stdout) is parsed line by line instead, skipping the
+    lines that are not JSON.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    data = data.strip()
+    if not data:
+        return []
+    try:
+        if data.startswith(b"["):
+            return loads(data)
+        return loads(b"[" + b",".join(line for line in data.splitlines() if line.strip()) + b"]")
+    except JSONDecodeError:
+        if not skip_invalid:
+            raise
+
+    items = []
+    for line in data.splitlines():
+        try:
+            parsed = loads(line)
+        except JSONDecodeError:
+            continue
+        if isinstance(parsed, list):
+            items.extend(parsed)
+        else:
+            items.append(parsed)
+    return items
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize *obj* to UTF-8 encoded JSON ``bytes``.
+
+    With ``indent=True`` the output is indented by two spaces, matching
+    ``json.dump(obj, f, indent=2)``.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
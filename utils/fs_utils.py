@@ -0,0 +1,299 @@
+"""Filesystem helpers shared by the project managers.
+
+Provides copy-on-write ("reflink") copies so that the copy fallbacks used
+when symlinks are unavailable do not have to duplicate every byte of a
+large wp-content tree.  On Linux (btrfs, xfs, overlay on top of those) this
+uses the ``FICLONE`` ioctl, on macOS (APFS) ``clonefile(2)``.  Whenever the
+filesystem refuses, the helpers fall back to a regular ``shutil.copy2``.
+:func:`link_copytree` tries hard links before either.
+"""
+
+import errno
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+__all__ = [
+    "TRASH_PREFIX",
+    "reflink_copy",
+    "reflink_copytree",
+    "link_copytree",
+    "async_rmtree",
+    "sweep_trash",
+    "atomic_write",
+    "write_if_changed",
+]
+
+# Directories renamed by async_rmtree() while they are being deleted.
+# Anything scanning the projects directory must skip dot-directories.
+TRASH_PREFIX = ".trash-"
+
+_SYSTEM = platform.system()
+
+# From <linux/fs.h>: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+# errno values meaning "this filesystem / pair of files cannot be cloned"
+_CLONE_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.ENOSYS,
+}
+
+_clonefile = None
+if _SYSTEM == "Darwin":
+    try:
+        import ctypes
+
+        _libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib", use_errno=True)
+        _clonefile = _libsystem.clonefile
+        _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        _clonefile.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _clonefile = None
+
+
+def _clone_file(src, dst) -> bool:
+    """Clone the data of *src* into *dst* without copying it.
+
+    Returns ``False`` when the platform or filesystem does not support
+    cloning; any other error is raised.
+    """
+    if _clonefile is not None:
+        if _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return True
+        err = ctypes.get_errno()
+        if err in _CLONE_UNSUPPORTED:
+            return False
+        raise OSError(err, os.strerror(err), str(src))
+
+    if fcntl is not None and _SYSTEM == "Linux":
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                return True
+            except OSError as exc:
+                if exc.errno in _CLONE_UNSUPPORTED:
+                    return False
+                raise
+
+    return False
+
+
+def reflink_copy(src, dst):
+    """Copy a single file, cloning its data when the filesystem allows.
+
+    Has the same signature and return value as ``shutil.copy2`` so it can be
+    used as a ``copy_function`` for ``shutil.copytree`` / ``shutil.move``.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if _clonefile is not None and os.path.isfile(dst) and not os.path.islink(dst):
+        # clonefile(2) fails with EEXIST instead of overwriting like copy2
+        if os.path.samefile(src, dst):
+            raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+        os.unlink(dst)
+    if _clone_file(src, dst):
+        shutil.copystat(src, dst)
+        return dst
+    return shutil.copy2(src, dst)
+
+
+def reflink_copytree(src, dst):
+    """Recursively copy *src* to *dst* using copy-on-write clones.
+
+    Behaves like ``shutil.copytree``.  The first file the filesystem refuses
+    to clone switches the rest of the tree to plain ``shutil.copy2`` so an
+    unsupported filesystem costs a single failed ioctl, not one per file.
+    """
+    can_clone = True
+
+    def _copy(s, d):
+        nonlocal can_clone
+        if can_clone:
+            if _clone_file(s, d):
+                shutil.copystat(s, d)
+                return d
+            can_clone = False
+        return shutil.copy2(s, d)
+
+    return shutil.copytree(str(src), str(dst), copy_function=_copy)
+
+
+def link_copytree(src, dst):
+    """Recursively mirror *src* at *dst* with hard links where possible.
+
+    For the symlink fallbacks: like a symlink, hard-linked files share their
+    data with *src* and cost no extra disk space, so edits made through
+    either path are seen by both.  Files that cannot be linked (different
+    filesystem, no hard-link support) are cloned as in
+    :func:`reflink_copytree`, or copied; as there, the first refusal
+    switches the rest of the tree to the next method.
+    """
+    can_link = True
+    can_clone = True
+
+    def _copy(s, d):
+        nonlocal can_link, can_clone
+        if can_link:
+            try:
+                os.link(s, d)
+                return d
+            except OSError:
+                can_link = False
+        if can_clone:
+            if _clone_file(s, d):
+                shutil.copystat(s, d)
+                return d
+            can_clone = False
+        return shutil.copy2(s, d)
+
+    return shutil.copytree(str(src), str(dst), copy_function=_copy)
+
+
+def _rmtree_logged(path, label=None) -> bool:
+    """``shutil.rmtree`` that keeps going past errors and reports them.
+
+    Entries that cannot be removed (typically files owned by a container
+    user such as www-data or mysql) are counted and the first one is printed
+    together with *label*, the path the user knows the tree by.  Returns
+    ``True`` if the tree is completely gone.
+    """
+    failures = []
+
+    def _on_error(func, failed_path, exc):
+        if isinstance(exc, tuple):  # onerror passes exc_info
+            exc = exc[1]
+        failures.append((failed_path, exc))
+
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_on_error)
+    else:
+        shutil.rmtree(path, onerror=_on_error)
+
+    if failures:
+        failed_path, exc = failures[0]
+        where = f"{label} (left in {path})" if label else path
+        print(f"Warning: could not delete {len(failures)} entries of {where}, first: {failed_path}: {exc}")
+    return not failures
+
+
+def async_rmtree(path) -> None:
+    """Remove a directory tree without waiting for it.
+
+    The directory is first renamed to a hidden ``.trash-<hex>`` sibling, which
+    is atomic on the same filesystem, so *path* is gone (and free to reuse) as
+    soon as this returns.  The actual unlinking runs in a daemon thread, which
+    prints the entries it could not remove; :func:`sweep_trash` retries them.
+    If the rename fails the tree is removed synchronously instead.
+    """
+    path = str(path)
+    trash = os.path.join(os.path.dirname(path), f"{TRASH_PREFIX}{uuid.uuid4().hex}")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        shutil.rmtree(path)
+        return
+
+    threading.Thread(
+        target=_rmtree_logged,
+        args=(trash, path),
+        daemon=True,
+    ).start()
+
+
+def sweep_trash(parent) -> None:
+    """Delete ``.trash-*`` leftovers in *parent* from interrupted removals.
+
+    Leftovers are announced, and anything that still cannot be deleted is
+    printed, so a tree that keeps failing does not go unnoticed.
+    """
+    try:
+        with os.scandir(parent) as it:
+            leftovers = [
+                entry.path for entry in it
+                if entry.name.startswith(TRASH_PREFIX) and entry.is_dir(follow_symlinks=False)
+            ]
+    except OSError:
+        return
+
+    def _remove_all():
+        for leftover in leftovers:
+            _rmtree_logged(leftover)
+
+    if leftovers:
+        print(f"Removing {len(leftovers)} leftover trash directories in {parent}")
+        threading.Thread(target=_remove_all, daemon=True).start()
+
+
+def atomic_write(path, data) -> None:
+    """Replace *path* with *data* (``str`` or ``bytes``) atomically.
+
+    The content goes to a temporary file in the same directory which is then
+    renamed over *path*, so a crash or a concurrent reader never sees a
+    half-written file.  An existing file's permission bits are kept; new
+    files get ``0644``.
+
+    The rename gives *path* a new inode.  Do not use this for files that are
+    bind-mounted individually into a running container: the container keeps
+    seeing the old inode until it is restarted.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    path = os.fspath(path)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o644
+
+    directory, name = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path, data, atomic: bool = True) -> bool:
+    """Write *data* to *path* unless the file already holds exactly that.
+
+    Regenerating a project mostly produces the files it already has; skipping
+    those writes avoids needless inode churn and mtime bumps.  With
+    ``atomic=False`` the file is rewritten in place (see :func:`atomic_write`
+    for when that matters).  Returns ``True`` if the file was written.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        if os.stat(path).st_size == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+
+    if atomic:
+        atomic_write(path, data)
+    else:
+        with open(path, "wb") as f:
+            f.write(data)
+    return True
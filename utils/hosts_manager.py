@@ -1,6 +1,8 @@
+import mmap
 import os
 import platform
 import subprocess
+import tempfile
 from pathlib import Path
 
 class HostsManager:
@@ -92,16 +94,135 @@ class HostsManager:
             print(f"Error removing host {domain}: {str(e)}")
             return False
     
-    def _host_exists(self, domain):
-        """Check if a domain already exists in the hosts file"""
+    def replace_host(self, old_domain, new_domain, ip="127.0.0.1"):
+        """Swap old_domain for new_domain in the hosts file in one write.
+
+        The file is read once and written once, so a domain change costs a
+        single admin prompt instead of one for the removal and one for the
+        addition. Returns the same dict as add_host().
+        """
+        if old_domain == new_domain:
+            return self.add_host(new_domain, ip)
+        
         try:
             with open(self.hosts_file, 'r') as f:
-                content = f.read()
+                lines = f.readlines()
+            
+            def names(line):
+                if line.lstrip().startswith('#'):
+                    return []
+                return line.split('#', 1)[0].split()[1:]
+            
+            kept = [line for line in lines if old_domain not in names(line)]
+            has_new = any(new_domain in names(line) for line in kept)
+            if len(kept) == len(lines) and has_new:
+                print(f"Host entry for {new_domain} already exists")
+                return {
+                    'success': True,
+                    'modified': False,
+                    'manual_action_required': False,
+                    'instruction': None
+                }
             
-            for line in content.split('\n'):
-                if line.strip() and not line.strip().startswith('#'):
-                    if domain in line:
-                        return True
+            if not has_new:
+                if kept and not kept[-1].endswith('\n'):
+                    kept[-1] += '\n'
+                kept.append(f"{ip}\t{new_domain}\n")
+            
+            self._create_backup()
+            if self.system == "windows":
+                self._write_hosts_windows(kept)
+                result = {
+                    'success': True,
+                    'modified': True,
+                    'manual_action_required': False,
+                    'instruction': None
+                }
+            else:
+                result = self._replace_hosts_unix(kept, old_domain, new_domain, ip, append=not has_new)
+            
+            if result['modified']:
+                print(f"Replaced {old_domain} with {new_domain} in hosts file")
+            return result
+            
+        except Exception as e:
+            print(f"Error replacing host {old_domain} with {new_domain}: {str(e)}")
+            return {
+                'success': False,
+                'modified': False,
+                'manual_action_required': False,
+                'instruction': None
+            }
+    
+    def _replace_hosts_unix(self, lines, old_domain, new_domain, ip, append=True):
+        """Write the edited hosts file on Unix-like systems.
+
+        On macOS the new content is copied over the hosts file behind a
+        single osascript admin prompt; elsewhere (and if that fails) a
+        command for the user to run is returned instead.
+        """
+        old_pattern = old_domain.replace('.', '\\.')
+        instruction = f"sudo sed -i.bak '/[[:space:]]{old_pattern}$/d' {self.hosts_file}"
+        if append:
+            instruction += f" && echo '{ip}\\t{new_domain}' | sudo tee -a {self.hosts_file}"
+        manual = {
+            'success': True,
+            'modified': False,
+            'manual_action_required': True,
+            'instruction': instruction
+        }
+        
+        if self.system != "darwin":
+            print(f"ℹ️  To update your hosts file, run:")
+            print(f"   {instruction}")
+            return manual
+        
+        tmp = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
+        try:
+            tmp.writelines(lines)
+            tmp.close()
+            # cat > keeps the hosts file's inode, owner and permissions
+            shell_cmd = f'/bin/cat {tmp.name} > {self.hosts_file}'
+            result = subprocess.run(
+                ["osascript", "-e",
+                 f"do shell script \"{shell_cmd}\" with administrator privileges"],
+                capture_output=True, text=True, timeout=60
+            )
+        except subprocess.TimeoutExpired:
+            print(f"⚠️  Hosts file dialog timed out")
+            return manual
+        finally:
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+        
+        if result.returncode != 0:
+            print(f"⚠️  Hosts file update was cancelled or failed: {result.stderr.strip()}")
+            return manual
+        
+        print(f"✅ Updated hosts file via macOS admin prompt")
+        return {
+            'success': True,
+            'modified': True,
+            'manual_action_required': False,
+            'instruction': None
+        }
+    
+    def _host_exists(self, domain):
+        """Check if a domain already exists in the hosts file"""
+        try:
+            needle = domain.encode()
+            with open(self.hosts_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return False
+                # Search the mapped file in C and only inspect the lines that
+                # actually contain the domain, instead of splitting every line
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    i = mm.find(needle)
+                    while i != -1:
+                        line_start = mm.rfind(b'\n', 0, i) + 1
+                        if not mm[line_start:i].lstrip().startswith(b'#'):
+                            return True
+                        i = mm.find(needle, i + len(needle))
             return False
             
         except Exception:
@@ -166,7 +287,6 @@ class HostsManager:
             if self.system == "darwin":
                 # macOS: use osascript for a native GUI sudo prompt (non-blocking for the terminal)
                 # Write the hosts line to a temp file, then use osascript to append it with admin privileges
-                import tempfile
                 tmp = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
                 tmp.write(f"{ip}\t{domain}\n")
                 tmp.close()
@@ -177,7 +297,6 @@ class HostsManager:
                     capture_output=True, text=True, timeout=60
                 )
                 # Clean up temp file if osascript failed
-                import os
                 if os.path.exists(tmp.name):
                     os.unlink(tmp.name)
                 if result.returncode == 0:
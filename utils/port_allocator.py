@@ -1,7 +1,8 @@
-import json
 import socket
 from pathlib import Path
 
+from . import fast_json
+
 
 class PortAllocator:
     """Allocates unique port blocks for WordPress projects.
@@ -37,14 +38,14 @@ class PortAllocator:
         if not self.projects_dir.exists():
             return used
         for project_dir in self.projects_dir.iterdir():
-            if not project_dir.is_dir():
+            if not project_dir.is_dir() or project_dir.name.startswith('.'):
                 continue
             config_file = project_dir / 'config.json'
             if not config_file.exists():
                 continue
             try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
+                with open(config_file, 'rb') as f:
+                    config = fast_json.loads(f.read())
                 idx = config.get('port_index')
                 if idx is not None:
                     used.add(idx)
@@ -1,11 +1,11 @@
 import os
-import json
 import shutil
 import subprocess
 import platform
 import re
-import time
+import threading
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .ssl_generator import SSLGenerator
@@ -18,6 +18,35 @@ from .wordpress_manager import WordPressManager
 from .port_allocator import PortAllocator
 from .docker_compose_detect import compose_command
 from .proxy_manager import ProxyManager
+from .fs_utils import reflink_copy, async_rmtree, sweep_trash
+
+_PROJECT_NAME_RE = re.compile(r'[A-Za-z0-9_\-]+')
+
+# Upper bound on projects processed at once by the bulk operations
+_DEFAULT_MAX_PARALLEL = 8
+
+
+def _max_parallel():
+    """Worker limit for bulk operations, overridable with WPLD_MAX_PARALLEL"""
+    try:
+        return max(1, int(os.environ.get('WPLD_MAX_PARALLEL', _DEFAULT_MAX_PARALLEL)))
+    except ValueError:
+        return _DEFAULT_MAX_PARALLEL
+
+
+def _repository_structure_config(repo_structure):
+    """The part of an analyzed repository structure stored in config.json"""
+    if not repo_structure:
+        return None
+    return {
+        'type': repo_structure['type'],
+        'has_wp_content': repo_structure['has_wp_content'],
+        'has_composer': repo_structure['has_composer'],
+        'has_package_json': repo_structure['has_package_json'],
+        'is_theme': repo_structure['is_theme'],
+        'is_plugin': repo_structure['is_plugin'],
+        'wp_content_path': str(repo_structure['wp_content_path']) if repo_structure['wp_content_path'] else None
+    }
 
 
 class ProjectManager:
@@ -26,6 +55,8 @@ class ProjectManager:
     def __init__(self):
         self.projects_dir = Path("wordpress-projects")
         self.projects_dir.mkdir(exist_ok=True)
+        # Finish removing projects whose background delete was interrupted
+        sweep_trash(self.projects_dir)
         
         # Initialize managers
         self.ssl_generator = SSLGenerator()
@@ -34,68 +65,71 @@ class ProjectManager:
         self.docker_manager = DockerManager()
         self.repository_manager = RepositoryManager()
         self.config_manager = ConfigManager()
-        self.wordpress_manager = WordPressManager(self.docker_manager)
+        self.wordpress_manager = WordPressManager(self.docker_manager, self.config_manager)
         self.proxy_manager = ProxyManager(Path('.'), self.projects_dir)
     
     def create_project(self, project_name, wordpress_version, repo_url, db_file_path=None, 
                       subfolder='', custom_domain='', enable_ssl=True, enable_redis=True):
         """Create a new WordPress project"""
+        # None until the project directory is known, so early failures skip cleanup
+        project_path = None
         try:
             # Validate project name
-            if not re.match(r'^[a-zA-Z0-9\-_]+$', project_name):
+            if not _PROJECT_NAME_RE.fullmatch(project_name):
                 return {'success': False, 'error': 'Project name can only contain letters, numbers, hyphens, and underscores'}
             
             project_path = self.projects_dir / project_name
             if project_path.exists():
                 return {'success': False, 'error': 'Project already exists'}
             
-            # Create project directory structure
-            project_path.mkdir()
-            (project_path / "wp-content").mkdir()
+            # Create project directory structure (the project dir itself first, so a
+            # concurrent create of the same name fails here instead of sharing it)
+            try:
+                project_path.mkdir()
+            except FileExistsError:
+                return {'success': False, 'error': 'Project already exists'}
+            for sub in ('wp-content', 'data', 'ssl'):
+                (project_path / sub).mkdir(exist_ok=True)
             data_dir = project_path / "data"
-            data_dir.mkdir()
-            (project_path / "ssl").mkdir()
             
             # If DB was uploaded to temp dir, move it into project data/ (API never creates project dir)
-            if db_file_path and Path(db_file_path).exists():
-                src = Path(db_file_path)
-                dst = data_dir / src.name
-                if dst.resolve() != src.resolve():
-                    shutil.move(str(src), str(dst))
-                    db_file_path = str(dst)
+            project_db_path = None
+            db_copied = False
+            if db_file_path:
+                db_src = Path(db_file_path)
+                if db_src.exists():
+                    project_db_path = data_dir / db_src.name
+                    if project_db_path.resolve() != db_src.resolve():
+                        shutil.move(str(db_src), str(project_db_path), copy_function=reflink_copy)
+                    db_file_path = str(project_db_path)
+                    db_copied = True
             
             # Generate domain
             domain = custom_domain if custom_domain else f"local.{project_name}.test"
             if subfolder:
                 domain = f"{domain}/{subfolder}"
+            host = domain.split('/')[0]
             
-            # Generate SSL certificates if enabled
-            if enable_ssl:
-                print(f"🔐 Generating SSL certificates for {domain.split('/')[0]}...")
-                # Ensure mkcert CA is installed for trusted certificates
-                if self.ssl_generator.mkcert_available and not self.ssl_generator._check_mkcert_ca_installed():
-                    print("🔐 Setting up mkcert local CA for trusted SSL certificates...")
-                    self.ssl_generator._install_mkcert_ca()
-                self.ssl_generator.generate_ssl_cert(project_name, domain.split('/')[0])
-            
-            # Clone repository if provided
-            repo_structure = None
-            if repo_url:
-                repo_structure = self.repository_manager.clone_repository(repo_url, project_path)
-            
-            # Allocate unique ports
-            allocator = PortAllocator(self.projects_dir)
-            port_index = allocator.allocate_next_index()
-            ports = allocator.get_ports_for_index(port_index)
-            print(f"   Allocated ports for project (index {port_index}): HTTP={ports['HTTP_PORT']}, HTTPS={ports['HTTPS_PORT']}")
+            # Certificate generation and the repository clone mostly wait on
+            # mkcert/git, and neither depends on the other or on the generated
+            # project files, so run them alongside the rest of the setup
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                ssl_job = executor.submit(self._generate_project_ssl, project_name, host) if enable_ssl else None
+                repo_job = executor.submit(self.repository_manager.clone_repository, repo_url, project_path) if repo_url else None
+                
+                # Allocate unique ports
+                allocator = PortAllocator(self.projects_dir)
+                port_index = allocator.allocate_next_index()
+                ports = allocator.get_ports_for_index(port_index)
+                print(f"   Allocated ports for project (index {port_index}): HTTP={ports['HTTP_PORT']}, HTTPS={ports['HTTPS_PORT']}")
 
-            # Create docker-compose.yml and related files
-            self.docker_manager.create_docker_compose(project_path, project_name, wordpress_version,
-                                                     domain, enable_ssl, enable_redis, ports=ports)
-            
-            # Create configuration files
-            self.config_manager.create_makefile(project_path, project_name, domain, db_file_path)
-            self.config_manager.create_nginx_config(project_path, project_name, domain, enable_ssl, subfolder)
+                # Create docker-compose.yml, .env, Makefile and nginx config
+                self._write_project_files(project_path, project_name, wordpress_version, domain,
+                                          enable_ssl, enable_redis, subfolder, ports, db_file_path)
+                
+                if ssl_job:
+                    ssl_job.result()
+                repo_structure = repo_job.result() if repo_job else None
             
             # Create project config
             repo_structure_json = None
@@ -126,22 +160,22 @@ class ProjectManager:
             }
             
             # Add to hosts file
-            hosts_result = self.hosts_manager.add_host(domain.split('/')[0])
+            hosts_result = self.hosts_manager.add_host(host)
             if isinstance(hosts_result, dict) and hosts_result.get('manual_action_required'):
                 config['hosts_instruction'] = hosts_result.get('instruction')
 
             # Database file is already saved to project data folder during upload
-            if db_file_path and Path(db_file_path).exists():
+            if db_copied:
                 # Update config with project-relative path for reference
-                db_filename = Path(db_file_path).name
-                config['db_file'] = f"data/{db_filename}"
+                config['db_file'] = f"data/{project_db_path.name}"
             
             # Save project config
             self.config_manager.create_project_config(project_path, config)
             
             # Start Docker containers
             print(f"🚀 Starting Docker containers...")
-            start_result = self._start_containers_with_setup(project_path, project_name, db_file_path)
+            start_result = self._start_containers_with_setup(
+                project_path, project_name, str(project_db_path) if db_copied else None)
             
             if not start_result['success']:
                 print(f"   ⚠️  Warning: {start_result['error']}")
@@ -156,22 +190,58 @@ class ProjectManager:
         except Exception as e:
             print(f"❌ Error creating project {project_name}: {str(e)}")
             # Clean up if project creation failed
-            self._cleanup_failed_project(project_path)
+            if project_path is not None:
+                self._cleanup_failed_project(project_path)
             return {'success': False, 'error': str(e)}
     
+    def _generate_project_ssl(self, project_name, host):
+        """Generate SSL certificates for a new project"""
+        print(f"🔐 Generating SSL certificates for {host}...")
+        # Ensure mkcert CA is installed for trusted certificates
+        if self.ssl_generator.mkcert_available and not self.ssl_generator._check_mkcert_ca_installed():
+            print("🔐 Setting up mkcert local CA for trusted SSL certificates...")
+            self.ssl_generator._install_mkcert_ca()
+        self.ssl_generator.generate_ssl_cert(project_name, host)
+    
     def list_projects(self):
         """List all WordPress projects"""
-        projects = []
-        for project_dir in self.projects_dir.iterdir():
-            if project_dir.is_dir():
+        candidates = []
+        # scandir reports the entry type from the directory listing itself, so
+        # the only per-project syscall left is read_project_config()'s stat
+        with os.scandir(self.projects_dir) as entries:
+            for entry in entries:
+                # Dot-directories are projects being deleted in the background
+                if entry.name.startswith('.') or not entry.is_dir():
+                    continue
+                project_dir = Path(entry.path)
                 config = self.config_manager.read_project_config(project_dir)
                 if config:
-                    try:
-                        status = self.docker_manager.get_project_status(project_dir)
-                        config['status'] = status
-                        projects.append(config)
-                    except Exception as e:
-                        print(f"Warning: could not load project {project_dir.name}: {e}")
+                    candidates.append((project_dir, config))
+        
+        # One `docker ps` for all projects instead of one compose call each
+        all_containers = self.docker_manager.get_all_project_containers()
+        
+        def load_status(candidate):
+            project_dir, config = candidate
+            try:
+                return self.docker_manager.get_project_status(project_dir, _prefetched=all_containers)
+            except Exception as e:
+                print(f"Warning: could not load project {project_dir.name}: {e}")
+                return None
+        
+        if all_containers is None and len(candidates) > 1:
+            # The batch query failed, so each project needs its own subprocess;
+            # they mostly wait on Docker, so run them concurrently
+            with ThreadPoolExecutor(max_workers=min(16, len(candidates))) as executor:
+                statuses = list(executor.map(load_status, candidates))
+        else:
+            statuses = [load_status(candidate) for candidate in candidates]
+        
+        projects = []
+        for (project_dir, config), status in zip(candidates, statuses):
+            if status is not None:
+                config['status'] = status
+                projects.append(config)
         return projects
     
     def get_project_status(self, project_name):
@@ -193,8 +263,9 @@ class ProjectManager:
             result = self.docker_manager.start_project(project_path)
             
             if result['success']:
-                # Give containers a moment to fully start
-                time.sleep(5)
+                # Wait for MySQL to accept connections instead of a fixed sleep
+                if not self.docker_manager.wait_for_mysql(project_path):
+                    print(f"   ⚠️  MySQL not ready yet, continuing anyway")
 
                 # Configure WordPress debug settings in wp-config.php
                 print(f"   🔧 Configuring WordPress debug settings...")
@@ -225,14 +296,12 @@ class ProjectManager:
         if not project_path.exists():
             return {'success': False, 'error': 'Project not found'}
 
-        # Disconnect proxy before stopping (network will be destroyed by down)
-        self.proxy_manager.on_project_stop(project_name)
-
+        # Containers are recreated in place; the project network survives
         result = self.docker_manager.restart_project(project_path)
 
         if result.get('success'):
-            time.sleep(3)
-            # Reconnect proxy to the newly-created network
+            self.docker_manager.wait_for_mysql(project_path)
+            # Make sure the proxy is attached and serving the current config
             config = self.config_manager.read_project_config(project_path)
             if config:
                 self.proxy_manager.on_project_start(project_name, config)
@@ -259,8 +328,8 @@ class ProjectManager:
                 if domain:
                     self.hosts_manager.remove_host(domain)
 
-            # Remove project directory
-            shutil.rmtree(project_path)
+            # Remove project directory (renamed away now, unlinked in the background)
+            async_rmtree(project_path)
             
             return {'success': True, 'message': 'Project deleted successfully'}
             
@@ -272,6 +341,11 @@ class ProjectManager:
         project_path = self.projects_dir / project_name
         return self.docker_manager.get_project_logs(project_path)
     
+    def stream_project_logs(self, project_name, tail_lines=100, follow=True):
+        """Yield log lines for a WordPress project as they are produced"""
+        project_path = self.projects_dir / project_name
+        return self.docker_manager.stream_project_logs(project_path, tail_lines, follow)
+    
     def get_wordpress_debug_logs(self, project_name, lines=50):
         """Get WordPress debug logs for a project"""
         project_path = self.projects_dir / project_name
@@ -306,19 +380,19 @@ class ProjectManager:
         project_path = self.projects_dir / project_name
         return self.wordpress_manager.update_wp_config(project_path, content)
     
-    def import_database(self, project_name, db_file_path, backup_before_import=True, url_search=None, url_replace=None):
-        """Import database file for a project. Optional url_search/url_replace to rewrite URLs in the dump (e.g. production → local)."""
+    def import_database(self, project_name, db_file_path, backup_before_import=True, url_search=None, url_replace=None, keep_repaired=False):
+        """Import database file for a project. Optional url_search/url_replace to rewrite URLs in the dump (e.g. production → local); keep_repaired saves the repaired dump if one is needed."""
         project_path = self.projects_dir / project_name
         
         # Check if containers are running
-        status = self.docker_manager.get_project_status(project_path)
+        status = self.docker_manager.get_project_status(project_path, fresh=True)
         if status.get('status') != 'running':
             return {'success': False, 'error': 'Project must be running to import database. Please start the project first.', 'logs': []}
         
         # Import the database
         result = self.database_manager.import_database(
             project_path, project_name, db_file_path, backup_before_import,
-            url_search=url_search, url_replace=url_replace
+            url_search=url_search, url_replace=url_replace, keep_repaired=keep_repaired
         )
         
         # If import was successful, ensure WordPress recognizes the imported database
@@ -335,7 +409,7 @@ class ProjectManager:
         project_path = self.projects_dir / project_name
         return self.wordpress_manager.run_wp_cli_command(project_path, command)
     
-    def add_wpcli_to_project(self, project_name):
+    def add_wpcli_to_project(self, project_name, quiet=False):
         """Add WP CLI service to existing project"""
         project_path = self.projects_dir / project_name
         config = self.config_manager.read_project_config(project_path)
@@ -343,25 +417,38 @@ class ProjectManager:
             return {'success': False, 'error': 'Project config not found'}
         
         return self.wordpress_manager.add_wpcli_to_project(
-            project_path, self.config_manager, self.docker_manager, config
+            project_path, self.config_manager, self.docker_manager, config,
+            quiet=quiet
         )
     
     def add_wpcli_to_all_projects(self):
-        """Add WP CLI service to all existing projects"""
-        projects = self.list_projects()
-        results = []
+        """Add WP CLI service to all existing projects
+
+        Projects are independent and the work is file I/O, so they are
+        processed by a thread pool of at most WPLD_MAX_PARALLEL (default 8)
+        workers. Results keep the order of list_projects().
+        """
+        project_names = [project['name'] for project in self.list_projects()]
+        print_lock = threading.Lock()
         
         print(f"🚀 Adding WP CLI to all existing projects...")
         
-        for project in projects:
-            project_name = project['name']
-            print(f"\n📦 Processing project: {project_name}")
-            result = self.add_wpcli_to_project(project_name)
-            results.append({
+        def add_one(project_name):
+            # quiet: workers run concurrently, only the locked line below prints
+            result = self.add_wpcli_to_project(project_name, quiet=True)
+            message = result.get('message', result.get('error', ''))
+            with print_lock:
+                print(f"📦 {project_name}: {'✅' if result['success'] else '❌'} {message}")
+            return {
                 'project': project_name,
                 'success': result['success'],
-                'message': result.get('message', result.get('error', ''))
-            })
+                'message': message
+            }
+        
+        results = []
+        if project_names:
+            with ThreadPoolExecutor(max_workers=min(_max_parallel(), len(project_names))) as executor:
+                results = list(executor.map(add_one, project_names))
         
         # Summary
         successful = [r for r in results if r['success']]
@@ -407,17 +494,17 @@ class ProjectManager:
             # Update config
             updates = {'domain': new_domain}
             if enable_ssl is not None:
-                updates['enable_ssl'] = enable_ssl
+                updates['enable_ssl'] = bool(enable_ssl)
             
             # Update hosts file
             print(f"   🔄 Updating hosts file...")
-            self.hosts_manager.remove_host(old_domain.split('/')[0])
-            hosts_result = self.hosts_manager.add_host(new_domain.split('/')[0])
+            new_host = new_domain.split('/')[0]
+            hosts_result = self.hosts_manager.replace_host(old_domain.split('/')[0], new_host)
 
             # Generate new SSL certificate if SSL is enabled
             if config.get('enable_ssl', True):
-                print(f"   🔐 Generating new SSL certificate for {new_domain.split('/')[0]}...")
-                self.ssl_generator.generate_ssl_cert(project_name, new_domain.split('/')[0])
+                print(f"   🔐 Generating new SSL certificate for {new_host}...")
+                self.ssl_generator.generate_ssl_cert(project_name, new_host)
             
             # Stop containers
             print(f"   🛑 Stopping containers...")
@@ -434,15 +521,10 @@ class ProjectManager:
                 allocator = PortAllocator(self.projects_dir)
                 existing_ports = allocator.get_ports_for_index(config['port_index'])
 
-            self.docker_manager.create_docker_compose(
+            self._write_project_files(
                 project_path, config['name'], config.get('wordpress_version', 'latest'),
                 new_domain, config.get('enable_ssl', True), config.get('enable_redis', True),
-                ports=existing_ports
-            )
-            
-            self.config_manager.create_nginx_config(
-                project_path, config['name'], new_domain,
-                config.get('enable_ssl', True), config.get('subfolder', '')
+                config.get('subfolder', ''), existing_ports, config.get('db_file')
             )
             
             # Start containers
@@ -462,6 +544,99 @@ class ProjectManager:
             print(f"   ❌ Error updating domain: {str(e)}")
             return {'success': False, 'error': str(e)}
 
+    def update_project_config(self, project_name, enable_ssl=None, enable_redis=None,
+                              subfolder=None, custom_domain=None):
+        """Change SSL, Redis, subfolder or domain settings of an existing project
+
+        Only the arguments that are given are considered, and only values that
+        differ from the current config count as changes. A call without real
+        changes returns early without touching any file or container.
+        Otherwise config.json and the generated files are rewritten once, and
+        a running project is recreated with a single `up -d --force-recreate`.
+        """
+        project_path = self.projects_dir / project_name
+        if not project_path.exists():
+            return {'success': False, 'error': 'Project not found'}
+        
+        try:
+            config = self.config_manager.read_project_config(project_path)
+            if not config:
+                return {'success': False, 'error': 'Project config not found'}
+            
+            old_domain = config.get('domain', f"local.{project_name}.test")
+            old_host, _, old_subfolder = old_domain.partition('/')
+            
+            # The domain stores "host/subfolder", so both settings feed into it
+            wanted = {}
+            new_subfolder = old_subfolder
+            if subfolder is not None:
+                new_subfolder = wanted['subfolder'] = subfolder.strip('/')
+            new_host = old_host
+            if custom_domain is not None:
+                new_host = custom_domain.strip().split('/')[0] or f"local.{project_name}.test"
+            wanted['domain'] = f"{new_host}/{new_subfolder}" if new_subfolder else new_host
+            if enable_ssl is not None:
+                wanted['enable_ssl'] = bool(enable_ssl)
+            if enable_redis is not None:
+                wanted['enable_redis'] = bool(enable_redis)
+            
+            # Keys missing from older configs take the values the generators default to
+            defaults = {
+                'domain': f"local.{project_name}.test",
+                'subfolder': '',
+                'enable_ssl': True,
+                'enable_redis': True,
+            }
+            updates = {field: value for field, value in wanted.items() if config.get(field, defaults[field]) != value}
+            if not updates:
+                return {'success': True, 'message': 'No configuration changes', 'updated_fields': []}
+            
+            print(f"🔄 Updating configuration for {project_name}: {', '.join(updates)}")
+            config.update(updates)
+            ssl_enabled = config.get('enable_ssl', True)
+            
+            hosts_result = None
+            if new_host != old_host:
+                print(f"   🔄 Updating hosts file...")
+                hosts_result = self.hosts_manager.replace_host(old_host, new_host)
+            if ssl_enabled and (new_host != old_host or 'enable_ssl' in updates):
+                self._generate_project_ssl(project_name, new_host)
+            
+            self.config_manager.update_project_config(project_path, updates)
+            
+            # Regenerate every file once for the combined change
+            print(f"   Updating configuration files...")
+            existing_ports = None
+            if config.get('port_index'):
+                existing_ports = PortAllocator(self.projects_dir).get_ports_for_index(config['port_index'])
+            files_changed = self._write_project_files(
+                project_path, config['name'], config.get('wordpress_version', 'latest'),
+                config['domain'], ssl_enabled, config.get('enable_redis', True),
+                config.get('subfolder', ''), existing_ports, config.get('db_file')
+            )
+            
+            # Only a running project whose files changed needs its containers recreated
+            if files_changed and self.docker_manager.get_project_status(project_path, fresh=True).get('status') in ('running', 'partial'):
+                print(f"   🚀 Recreating containers with the new configuration...")
+                start_result = self.docker_manager.start_project(project_path, recreate=True)
+                if not start_result['success']:
+                    return {'success': False, 'error': f'Failed to restart containers: {start_result["error"]}'}
+                self.proxy_manager.on_project_start(project_name, config)
+            
+            print(f"   ✅ Configuration updated")
+            response = {
+                'success': True,
+                'message': f'Updated {", ".join(updates)}',
+                'updated_fields': list(updates)
+            }
+            if hosts_result and hosts_result.get('manual_action_required'):
+                response['hosts_instruction'] = hosts_result.get('instruction')
+            return response
+            
+        except Exception as e:
+            print(f"   ❌ Error updating configuration: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
     def update_repository(self, project_name, new_repo_url):
         """Update repository URL and re-clone content for an existing project"""
         project_path = self.projects_dir / project_name
@@ -474,6 +649,34 @@ class ProjectManager:
                 return {'success': False, 'error': 'Project config not found'}
             
             old_repo = config.get('repo_url', 'none')
+            
+            # Same URL and a healthy clone: fast-forward it rather than
+            # deleting and re-cloning the whole repository
+            repo_dir = project_path / "repository"
+            if new_repo_url and new_repo_url == old_repo and self.repository_manager.is_git_work_tree(repo_dir):
+                print(f"🔄 Repository URL unchanged, refreshing {new_repo_url}")
+                # A symlinked wp-content follows the pull by itself; a copied one
+                # is replaced, which running containers (bind-mounted on the old
+                # directory) would not see, so those are stopped around it
+                wp_content_linked = (project_path / "wp-content").is_symlink()
+                if not wp_content_linked:
+                    print(f"   🛑 Stopping containers...")
+                    self.docker_manager.stop_project(project_path)
+                
+                result = self.repository_manager.refresh_repository(project_path)
+                if result['success']:
+                    self.config_manager.update_project_config(project_path, {
+                        'repository_structure': _repository_structure_config(result['repository_structure'])
+                    })
+                    if not wp_content_linked:
+                        print(f"   🚀 Starting containers...")
+                        start_result = self.docker_manager.start_project(project_path)
+                        if not start_result['success']:
+                            return {'success': False, 'error': f'Failed to start containers: {start_result["error"]}'}
+                    print(f"   ✅ Repository refreshed")
+                    return {'success': True, 'message': f'Repository {new_repo_url} is unchanged, pulled latest changes'}
+                print(f"   ⚠️  Pull failed, re-cloning instead: {result['error']}")
+            
             print(f"🔄 Updating repository from {old_repo} to {new_repo_url}")
             
             # Stop containers to avoid conflicts
@@ -484,19 +687,10 @@ class ProjectManager:
             repo_structure = self.repository_manager.update_repository(project_path, new_repo_url)
             
             # Update config
-            updates = {'repo_url': new_repo_url}
-            if repo_structure:
-                updates['repository_structure'] = {
-                    'type': repo_structure['type'],
-                    'has_wp_content': repo_structure['has_wp_content'],
-                    'has_composer': repo_structure['has_composer'],
-                    'has_package_json': repo_structure['has_package_json'],
-                    'is_theme': repo_structure['is_theme'],
-                    'is_plugin': repo_structure['is_plugin'],
-                    'wp_content_path': str(repo_structure['wp_content_path']) if repo_structure['wp_content_path'] else None
-                }
-            else:
-                updates['repository_structure'] = None
+            updates = {
+                'repo_url': new_repo_url,
+                'repository_structure': _repository_structure_config(repo_structure)
+            }
             
             self.config_manager.update_project_config(project_path, updates)
             
@@ -591,15 +785,15 @@ class ProjectManager:
                 return self.import_database(project_name, db_file_path, backup_before_import)
             
             # Ensure project is running
-            status = self.docker_manager.get_project_status(project_path)
+            status = self.docker_manager.get_project_status(project_path, fresh=True)
             if status.get('status') != 'running':
                 print(f"   🚀 Starting project to import initial database...")
                 start_result = self.docker_manager.start_project(project_path)
                 if not start_result.get('success'):
                     return {'success': False, 'error': f'Failed to start project: {start_result.get("error")}', 'logs': []}
-                # Wait a moment for containers to be ready
-                import time
-                time.sleep(5)
+                # Wait for MySQL to accept connections before importing
+                if not self.docker_manager.wait_for_mysql(project_path):
+                    print(f"   ⚠️  MySQL not ready yet, continuing anyway")
             
             # Save database file to project data folder if it's not already there
             db_file_path_obj = Path(db_file_path)
@@ -609,8 +803,7 @@ class ProjectManager:
                 data_dir.mkdir(exist_ok=True)
                 target_path = data_dir / db_file_path_obj.name
                 if db_file_path_obj.exists():
-                    import shutil
-                    shutil.copy2(db_file_path_obj, target_path)
+                    reflink_copy(db_file_path_obj, target_path)
                     db_file_path = str(target_path)
                 else:
                     return {'success': False, 'error': f'Database file not found: {db_file_path}', 'logs': []}
@@ -640,8 +833,32 @@ class ProjectManager:
             return {'success': False, 'error': str(e), 'logs': []}
     
     
+    def _write_project_files(self, project_path, project_name, wordpress_version, domain,
+                             enable_ssl, enable_redis, subfolder='', ports=None, db_file_path=None):
+        """Generate docker-compose.yml/.env, Makefile and nginx.conf for a project
+
+        The files are independent of each other, so the generators run
+        concurrently; the first error is re-raised once all have finished.
+        Returns True if any file was rewritten.
+        """
+        manifest = [
+            (self.docker_manager.create_docker_compose,
+             (project_path, project_name, wordpress_version, domain, enable_ssl, enable_redis, ports)),
+            (self.config_manager.create_makefile,
+             (project_path, project_name, domain, db_file_path)),
+            (self.config_manager.create_nginx_config,
+             (project_path, project_name, domain, enable_ssl, subfolder)),
+        ]
+        with ThreadPoolExecutor(max_workers=len(manifest)) as executor:
+            jobs = [executor.submit(generate, *args) for generate, args in manifest]
+        return any([job.result() for job in jobs])
+    
     def _start_containers_with_setup(self, project_path, project_name, db_file_path):
-        """Start containers and perform initial setup"""
+        """Start containers and perform initial setup
+
+        db_file_path is the database dump already placed in the project's
+        data/ folder, or None when there is nothing to import.
+        """
         try:
             start_result = subprocess.run(
                 compose_command('up', '-d'),
@@ -650,24 +867,27 @@ class ProjectManager:
                 text=True,
                 timeout=120
             )
+            self.docker_manager.invalidate_status(project_path)
             
             if start_result.returncode == 0:
                 print(f"   ✅ Docker containers started successfully")
                 
-                # Give containers a moment to fully start
-                time.sleep(5)
+                # Wait for MySQL to accept connections instead of a fixed sleep
+                print(f"   ⏳ Waiting for MySQL to be ready...")
+                if not self.docker_manager.wait_for_mysql(project_path):
+                    print(f"   ⚠️  MySQL not ready yet, continuing anyway")
                 
                 # Configure WordPress debug settings in wp-config.php
                 print(f"   🔧 Configuring WordPress debug settings...")
                 self.wordpress_manager.fix_wp_config_debug(project_path)
                 
                 # If database file was provided, import it after containers are running
-                if db_file_path and Path(project_path / "data" / Path(db_file_path).name).exists():
+                if db_file_path:
                     print(f"   📋 Importing database...")
                     
                     db_import_result = self.database_manager.import_database(
                         project_path, project_name,
-                        str(project_path / "data" / Path(db_file_path).name),
+                        db_file_path,
                         backup_before_import=False
                     )
                     
@@ -692,7 +912,7 @@ class ProjectManager:
         """Clean up if project creation failed"""
         try:
             if project_path.exists():
-                shutil.rmtree(project_path)
+                async_rmtree(project_path)
                 print(f"   🧹 Cleaned up failed project directory")
         except Exception as e:
             print(f"Warning: cleanup failed: {e}")
@@ -727,16 +947,9 @@ class ProjectManager:
             if not cert_file.exists() or not key_file.exists():
                 print(f"   🔐 SSL certificates missing for {project_name}, generating...")
                 ssl_needs_update = True
-            else:
-                # Check if certificates are expired or need regeneration
-                try:
-                    cert_age = time.time() - cert_file.stat().st_mtime
-                    if cert_age > 30 * 24 * 3600:  # 30 days
-                        print(f"   🔐 SSL certificates are old for {project_name}, regenerating...")
-                        ssl_needs_update = True
-                except Exception as e:
-                    print(f"Warning: SSL cert age check failed: {e}")
-                    ssl_needs_update = True
+            elif not self.ssl_generator.cert_is_valid(cert_file):
+                print(f"   🔐 SSL certificates expired or expiring soon for {project_name}, regenerating...")
+                ssl_needs_update = True
             
             # Regenerate SSL certificates if needed
             if ssl_needs_update:
@@ -784,22 +997,16 @@ class ProjectManager:
             'ports': ports,
         })
 
-        # Rewrite .env with new ports
-        self.docker_manager.create_docker_compose(
+        # Rewrite .env with new ports (the other files are regenerated for consistency)
+        self._write_project_files(
             project_path, config['name'],
             config.get('wordpress_version', 'latest'),
             config.get('domain', f'local.{project_name}.test'),
             config.get('enable_ssl', True),
             config.get('enable_redis', True),
-            ports=ports,
-        )
-
-        # Regenerate nginx config (unchanged, but ensures consistency)
-        self.config_manager.create_nginx_config(
-            project_path, config['name'],
-            config.get('domain', f'local.{project_name}.test'),
-            config.get('enable_ssl', True),
             config.get('subfolder', ''),
+            ports,
+            config.get('db_file'),
         )
 
         return {
@@ -813,7 +1020,7 @@ class ProjectManager:
         """Migrate all existing projects to unique ports."""
         results = []
         for project_dir in sorted(self.projects_dir.iterdir()):
-            if not project_dir.is_dir():
+            if not project_dir.is_dir() or project_dir.name.startswith('.'):
                 continue
             config = self.config_manager.read_project_config(project_dir)
             if not config:
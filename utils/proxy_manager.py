@@ -11,12 +11,13 @@ Lifecycle hooks:
     - ``regenerate_config`` -- rebuild all configs from project config.json files
 """
 
-import json
 import subprocess
 import datetime
 from pathlib import Path
 
 from .docker_compose_detect import compose_command
+from . import fast_json
+from .fs_utils import write_if_changed
 
 
 class ProxyManager:
@@ -113,13 +114,13 @@ class ProxyManager:
 
         # Generate one config per running project
         for project_dir in sorted(self.projects_dir.iterdir()):
-            if not project_dir.is_dir():
+            if not project_dir.is_dir() or project_dir.name.startswith('.'):
                 continue
             config_file = project_dir / "config.json"
             if not config_file.exists():
                 continue
             try:
-                config = json.loads(config_file.read_text())
+                config = fast_json.loads(config_file.read_bytes())
                 project_name = config.get("name", project_dir.name)
                 if self._is_project_running(project_dir):
                     self._write_project_conf(project_name, config)
@@ -157,7 +158,7 @@ class ProxyManager:
         try:
             subprocess.run(
                 ["docker", "network", "disconnect", network_name, self.PROXY_CONTAINER],
-                capture_output=True, text=True, timeout=15,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15,
             )
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
@@ -183,7 +184,7 @@ class ProxyManager:
         that were already running before the proxy was recreated.
         """
         for project_dir in self.projects_dir.iterdir():
-            if not project_dir.is_dir():
+            if not project_dir.is_dir() or project_dir.name.startswith('.'):
                 continue
             config_file = project_dir / "config.json"
             if not config_file.exists():
@@ -191,12 +192,12 @@ class ProxyManager:
             if not self._is_project_running(project_dir):
                 continue
             try:
-                config = json.loads(config_file.read_text())
+                config = fast_json.loads(config_file.read_bytes())
                 project_name = config.get("name", project_dir.name)
                 network_name = f"{project_name.lower()}_wordpress_network"
                 subprocess.run(
                     ["docker", "network", "connect", network_name, self.PROXY_CONTAINER],
-                    capture_output=True, text=True, timeout=15,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15,
                 )
             except Exception:
                 pass
@@ -229,21 +230,13 @@ class ProxyManager:
             result = subprocess.run(
                 compose_command("ps", "--format", "json"),
                 cwd=project_path,
-                capture_output=True, text=True, timeout=10,
+                capture_output=True, timeout=10,
             )
             if result.returncode != 0:
                 return False
-            for line in result.stdout.strip().split("\n"):
-                if not line:
-                    continue
-                try:
-                    container = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if container.get("State") == "running":
-                    return True
-            return False
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            containers = fast_json.loads_lines(result.stdout, skip_invalid=True)
+            return any(isinstance(c, dict) and c.get("State") == "running" for c in containers)
+        except (subprocess.TimeoutExpired, FileNotFoundError, OSError, fast_json.JSONDecodeError):
             return False
 
     def _write_project_conf(self, project_name, config):
@@ -322,8 +315,10 @@ class ProxyManager:
                 "}",
             ]
 
+        # conf.d/ is mounted as a directory, so the atomic replace is visible to
+        # the proxy and a reload never reads a half-written server block
         conf_file = self.conf_dir / f"{project_name}.conf"
-        conf_file.write_text("\n".join(lines) + "\n")
+        write_if_changed(conf_file, "\n".join(lines) + "\n")
 
     def _reload_nginx(self):
         """Reload nginx config without downtime. Silently ignored if proxy is not running."""
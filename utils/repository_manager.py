@@ -1,18 +1,63 @@
 import os
+import re
 import subprocess
 import shutil
+import sys
+import threading
 import time
 from pathlib import Path
 
+from .fs_utils import link_copytree, async_rmtree, sweep_trash
+
+# WordPress reads plugin headers from the first 8 KiB of a file, case-insensitively
+_PLUGIN_HEADER_RE = re.compile(rb'Plugin Name\s*:', re.IGNORECASE)
+_PLUGIN_HEADER_READ = 8192
+
+# Environment variables passed through to git: what it needs to find itself,
+# the user's config and SSH agent, proxies and CA bundles, and what credential
+# helpers (libsecret, Git Credential Manager) need to reach the desktop session.
+# Everything else in our environment stays out of the subprocess.
+_GIT_ENV_PASSTHROUGH = (
+    'PATH', 'HOME', 'USER', 'LOGNAME', 'LANG', 'LC_ALL', 'TMPDIR', 'DISPLAY', 'WAYLAND_DISPLAY',
+    'CURL_CA_BUNDLE', 'SSL_CERT_FILE', 'SSL_CERT_DIR',
+    # Windows
+    'SYSTEMROOT', 'USERPROFILE', 'HOMEDRIVE', 'HOMEPATH', 'APPDATA', 'LOCALAPPDATA',
+    'PROGRAMDATA', 'TEMP', 'TMP', 'COMSPEC', 'PATHEXT',
+)
+# ... plus every variable with one of these prefixes (GIT_CONFIG_GLOBAL,
+# SSH_AUTH_SOCK, XDG_RUNTIME_DIR, DBUS_SESSION_BUS_ADDRESS, GCM_*, ...)
+_GIT_ENV_PASSTHROUGH_PREFIXES = ('GIT_', 'SSH_', 'XDG_', 'DBUS_', 'GCM_')
+
+
+def _git_env(**overrides):
+    """Minimal environment for git with interactive credential prompts disabled"""
+    env = {
+        name: value for name, value in os.environ.items()
+        if value and (
+            name in _GIT_ENV_PASSTHROUGH
+            or name.startswith(_GIT_ENV_PASSTHROUGH_PREFIXES)
+            or name.lower().endswith('_proxy')  # http(s)_proxy, all_proxy, no_proxy in either case
+        )
+    }
+    env['GIT_TERMINAL_PROMPT'] = '0'  # Disable interactive prompts
+    env['GIT_ASKPASS'] = 'echo'       # Provide empty password for HTTPS
+    env.update(overrides)
+    return env
+
 
 class RepositoryManager:
     """Handles Git repository operations and repository analysis"""
     
     def __init__(self):
-        pass
+        # str(repo_dir) -> (st_mtime_ns of repo_dir, structure dict)
+        self._structure_cache = {}
     
     def clone_repository(self, repo_url, project_path):
-        """Clone entire repository into project directory"""
+        """Clone entire repository into project directory
+
+        Only the tip commit is fetched: a dev checkout to link into
+        wp-content needs no history.
+        """
         start_time = time.time()
         repo_dir = None
         
@@ -28,16 +73,15 @@ class RepositoryManager:
             # Check if repository directory already exists
             if repo_dir.exists():
                 print(f"   ⚠️  Repository directory already exists, removing it first...")
-                shutil.rmtree(repo_dir)
+                async_rmtree(repo_dir)
             
             print(f"🔄 Starting repository clone operation")
             print(f"   📍 Repository URL: {repo_url}")
             print(f"   📂 Target directory: {repo_dir}")
             
-            # Create environment with credential helpers disabled to avoid prompts
-            env = os.environ.copy()
-            env['GIT_TERMINAL_PROMPT'] = '0'  # Disable interactive prompts
-            env['GIT_ASKPASS'] = 'echo'       # Provide empty password for HTTPS
+            # Create environment with credential helpers disabled to avoid prompts;
+            # transfers that stall below 1 KB/s for 30s abort instead of waiting for the timeout
+            env = _git_env(GIT_HTTP_LOW_SPEED_LIMIT='1000', GIT_HTTP_LOW_SPEED_TIME='30')
             
             # Log git version for debugging
             git_version_result = subprocess.run(
@@ -51,20 +95,20 @@ class RepositoryManager:
             
             # Clone repository directly to repository directory
             clone_timeout = 300  # 5 minutes for large repos / slow connections
+            clone_args = [
+                'git', 'clone', '--progress', '--depth=1', '--single-branch',
+                '--recurse-submodules', '--shallow-submodules', repo_url, str(repo_dir)
+            ]
             print(f"   ⏱️  Timeout: {clone_timeout} seconds")
-            print(f"   🚀 Executing: git clone --progress {repo_url} {repo_dir}")
+            print(f"   🚀 Executing: {' '.join(clone_args)}")
             print(f"   ⏳ Cloning repository (this may take a while for large repositories)...")
             print(f"   📡 Streaming git output in real-time:")
             print(f"   {'-' * 60}")
             
             # Use Popen to stream output in real-time
             # Git sends progress to stderr, so we merge it into stdout
-            process = subprocess.Popen([
-                'git', 'clone', 
-                '--progress',                # Show progress
-                repo_url, 
-                str(repo_dir)
-            ], 
+            process = subprocess.Popen(
+            clone_args,
             env=env, 
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,  # Merge stderr into stdout
@@ -78,8 +122,6 @@ class RepositoryManager:
             
             try:
                 # Read output line by line with timeout checking
-                import threading
-                import sys
                 
                 def read_output():
                     """Read output in a separate thread"""
@@ -254,7 +296,32 @@ class RepositoryManager:
             raise e
     
     def analyze_repository_structure(self, repo_dir):
-        """Analyze repository structure to determine type and content"""
+        """Analyze repository structure to determine type and content
+
+        The result only depends on the entries at the repository root (and
+        the headers of its PHP files), so it is cached until the directory's
+        mtime changes, i.e. until a root entry is added, removed or renamed,
+        which includes git replacing files on checkout or pull.
+        """
+        try:
+            mtime = os.stat(repo_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        key = str(repo_dir)
+        cached = self._structure_cache.get(key)
+        if mtime is not None and cached and cached[0] == mtime:
+            return dict(cached[1])
+        
+        structure = self._analyze_repository_structure(repo_dir)
+        if mtime is None:
+            self._structure_cache.pop(key, None)
+        else:
+            self._structure_cache[key] = (mtime, structure)
+        return dict(structure)
+    
+    def _analyze_repository_structure(self, repo_dir):
+        """Scan the repository root; see analyze_repository_structure()"""
         structure = {
             'type': 'unknown',
             'has_wp_content': False,
@@ -266,35 +333,46 @@ class RepositoryManager:
             'wp_content_path': None
         }
         
-        if not repo_dir.exists():
+        # Gather everything we need from the repository root in a single directory scan
+        root_dirs = set()
+        root_files = set()
+        php_files = []
+        try:
+            with os.scandir(repo_dir) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            root_dirs.add(entry.name)
+                        elif entry.is_file():
+                            root_files.add(entry.name)
+                            if entry.name.endswith('.php'):
+                                php_files.append(entry)
+                    except OSError:
+                        continue
+        except FileNotFoundError:
             print(f"      ⚠️  Repository directory does not exist: {repo_dir}")
             return structure
         
         # Check for wp-content directory
-        wp_content_path = repo_dir / "wp-content"
-        if wp_content_path.exists() and wp_content_path.is_dir():
+        if 'wp-content' in root_dirs:
             structure['has_wp_content'] = True
-            structure['wp_content_path'] = wp_content_path
+            structure['wp_content_path'] = repo_dir / "wp-content"
             structure['type'] = 'full-wordpress-project'
             print(f"      ✓ Found wp-content/ directory")
         
         # Check for Composer
-        composer_file = repo_dir / "composer.json"
-        if composer_file.exists():
+        if 'composer.json' in root_files:
             structure['has_composer'] = True
             print(f"      ✓ Found composer.json")
         
         # Check for Node.js/NPM
-        package_file = repo_dir / "package.json"
-        if package_file.exists():
+        if 'package.json' in root_files:
             structure['has_package_json'] = True
             print(f"      ✓ Found package.json")
         
         # Check if the repo root IS the wp-content (has plugins/ and themes/ at root)
         if not structure['has_wp_content']:
-            plugins_dir = repo_dir / "plugins"
-            themes_dir = repo_dir / "themes"
-            if plugins_dir.exists() and plugins_dir.is_dir() and themes_dir.exists() and themes_dir.is_dir():
+            if 'plugins' in root_dirs and 'themes' in root_dirs:
                 structure['is_wp_content'] = True
                 structure['wp_content_path'] = repo_dir
                 structure['type'] = 'wp-content-root'
@@ -303,27 +381,29 @@ class RepositoryManager:
         # If no wp-content, check if it's a theme or plugin
         if not structure['has_wp_content'] and not structure['is_wp_content']:
             # Check for theme indicators
-            style_css = repo_dir / "style.css"
-            index_php = repo_dir / "index.php"
-            if style_css.exists() and index_php.exists():
+            if 'style.css' in root_files and 'index.php' in root_files:
                 structure['is_theme'] = True
                 structure['type'] = 'wordpress-theme'
                 print(f"      ✓ Detected theme structure (style.css + index.php)")
             
             # Check for plugin indicators
-            elif any(repo_dir.glob("*.php")):
+            elif php_files:
                 # Look for plugin header in PHP files
-                php_files = list(repo_dir.glob("*.php"))
                 print(f"      🔍 Checking {len(php_files)} PHP file(s) for plugin header...")
                 for php_file in php_files:
                     try:
-                        with open(php_file, 'r', encoding='utf-8') as f:
-                            content = f.read(1000)  # Read first 1000 chars
-                            if "Plugin Name:" in content:
-                                structure['is_plugin'] = True
-                                structure['type'] = 'wordpress-plugin'
-                                print(f"      ✓ Detected plugin structure in {php_file.name}")
-                                break
+                        # The header sits in the leading comment; a raw fd read skips
+                        # both decoding and the buffered file object
+                        fd = os.open(php_file.path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+                        try:
+                            head = os.read(fd, _PLUGIN_HEADER_READ)
+                        finally:
+                            os.close(fd)
+                        if _PLUGIN_HEADER_RE.search(head):
+                            structure['is_plugin'] = True
+                            structure['type'] = 'wordpress-plugin'
+                            print(f"      ✓ Detected plugin structure in {php_file.name}")
+                            break
                     except Exception as e:
                         print(f"      ⚠️  Could not read {php_file.name}: {str(e)}")
                         continue
@@ -359,7 +439,7 @@ class RepositoryManager:
             except OSError as e:
                 print(f"      ⚠️  Symlink failed ({str(e)}), copying instead...")
                 try:
-                    shutil.copytree(str(repo_dir), str(wp_content_path))
+                    link_copytree(str(repo_dir), str(wp_content_path))
                     print(f"      ✅ Copied repository as wp-content")
                 except Exception as copy_error:
                     raise Exception(f"Failed to link or copy wp-content: {copy_error}")
@@ -384,7 +464,7 @@ class RepositoryManager:
             except OSError as e:
                 print(f"      ⚠️  Symlink failed ({str(e)}), copying instead...")
                 try:
-                    shutil.copytree(str(repo_wp_content), str(wp_content_path))
+                    link_copytree(str(repo_wp_content), str(wp_content_path))
                     print(f"      ✅ Copied wp-content from repository")
                 except Exception as copy_error:
                     raise Exception(f"Failed to link or copy wp-content: symlink error: {str(e)}, copy error: {str(copy_error)}")
@@ -431,7 +511,7 @@ class RepositoryManager:
             try:
                 if theme_path.exists():
                     shutil.rmtree(theme_path)
-                shutil.copytree(str(repo_dir), str(theme_path))
+                link_copytree(str(repo_dir), str(theme_path))
                 print(f"   🎨 Copied theme to: wp-content/themes/{theme_name}")
             except Exception as copy_error:
                 raise Exception(f"Failed to link or copy theme: symlink error: {str(e)}, copy error: {str(copy_error)}")
@@ -463,7 +543,7 @@ class RepositoryManager:
             try:
                 if plugin_path.exists():
                     shutil.rmtree(plugin_path)
-                shutil.copytree(str(repo_dir), str(plugin_path))
+                link_copytree(str(repo_dir), str(plugin_path))
                 print(f"   🔌 Copied plugin to: wp-content/plugins/{plugin_name}")
             except Exception as copy_error:
                 raise Exception(f"Failed to link or copy plugin: symlink error: {str(e)}, copy error: {str(copy_error)}")
@@ -474,11 +554,15 @@ class RepositoryManager:
         repo_dir = project_path / "repository"
         wp_content_path = project_path / "wp-content"
         
-        # Remove old repository if it exists
+        # Leftovers of an update that was interrupted mid-delete
+        sweep_trash(project_path)
+        
+        # Remove old repository if it exists; the old tree is renamed out of
+        # the way and deleted in the background so the clone can start now
         if repo_dir.exists():
             print(f"   🗑️  Removing old repository directory...")
-            shutil.rmtree(repo_dir)
-            print(f"   ✅ Old repository removed")
+            async_rmtree(repo_dir)
+            print(f"   ✅ Old repository moved aside, deleting it in the background")
         
         # Remove old wp-content symlink/copy
         if wp_content_path.exists():
@@ -487,8 +571,8 @@ class RepositoryManager:
                 wp_content_path.unlink()
                 print(f"      ✓ Removed symlink")
             else:
-                shutil.rmtree(wp_content_path)
-                print(f"      ✓ Removed directory")
+                async_rmtree(wp_content_path)
+                print(f"      ✓ Moved directory aside, deleting it in the background")
         
         # Create new wp-content directory
         wp_content_path.mkdir()
@@ -559,8 +643,49 @@ class RepositoryManager:
                 'error': str(e)
             }
     
-    def pull_repository_updates(self, project_path):
-        """Pull the latest changes from the repository"""
+    def is_git_work_tree(self, repo_dir):
+        """Whether repo_dir is the top level of a usable git checkout"""
+        if not repo_dir.is_dir():
+            return False
+        try:
+            result = subprocess.run(
+                ['git', '-C', str(repo_dir), 'rev-parse', '--show-toplevel'],
+                capture_output=True,
+                text=True,
+                env=_git_env(),
+                timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        # A broken checkout inside another git tree would report that tree instead
+        return result.returncode == 0 and Path(result.stdout.strip()).resolve() == repo_dir.resolve()
+    
+    def refresh_repository(self, project_path):
+        """Fast-forward the existing clone instead of cloning it again
+
+        A symlinked wp-content sees the new files right away; a copied one
+        (symlink fallback) is set up again from the updated checkout.
+        """
+        repo_dir = project_path / "repository"
+        wp_content_path = project_path / "wp-content"
+        
+        print(f"   📥 Pulling latest changes (fast-forward only)...")
+        result = self.pull_repository_updates(project_path, ff_only=True)
+        if not result['success']:
+            return result
+        
+        repo_structure = self.analyze_repository_structure(repo_dir)
+        if not wp_content_path.is_symlink():
+            self.setup_wp_content_from_repo(repo_dir, wp_content_path, repo_structure)
+        
+        result['repository_structure'] = repo_structure
+        return result
+    
+    def pull_repository_updates(self, project_path, ff_only=False):
+        """Pull the latest changes from the repository
+
+        With ff_only=True a pull that would need a merge fails instead.
+        """
         repo_dir = project_path / "repository"
         
         if not repo_dir.exists():
@@ -568,13 +693,11 @@ class RepositoryManager:
         
         try:
             # Create environment with credential helpers disabled to avoid prompts
-            env = os.environ.copy()
-            env['GIT_TERMINAL_PROMPT'] = '0'
-            env['GIT_ASKPASS'] = 'echo'
+            env = _git_env()
             
             # Pull latest changes
             result = subprocess.run(
-                ['git', 'pull'],
+                ['git', 'pull', '--ff-only'] if ff_only else ['git', 'pull'],
                 cwd=repo_dir,
                 capture_output=True,
                 text=True,
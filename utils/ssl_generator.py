@@ -15,6 +15,10 @@ class SSLGenerator:
         self.ssl_dir.mkdir(exist_ok=True)
         self.projects_dir = Path("wordpress-projects")
         self.mkcert_available = self._check_mkcert_available()
+        # Set once the CA check succeeds; a missing CA is checked again each time
+        self._mkcert_ca_installed = False
+        # str(cert_file) -> (st_mtime_ns, not_valid_after as aware UTC datetime)
+        self._cert_expiry_cache = {}
     
     def _check_mkcert_available(self):
         """Check if mkcert is available on the system"""
@@ -26,7 +30,18 @@ class SSLGenerator:
             return False
     
     def _check_mkcert_ca_installed(self):
-        """Check if mkcert local CA is installed in system trust store"""
+        """Check if mkcert local CA is installed in system trust store
+
+        A positive answer is remembered for the lifetime of this instance, so
+        that generating certificates for many projects runs `mkcert -CAROOT`
+        once. A missing CA is not cached: the user may install it at any time.
+        """
+        if not self._mkcert_ca_installed:
+            self._mkcert_ca_installed = self._query_mkcert_ca_installed()
+        return self._mkcert_ca_installed
+    
+    def _query_mkcert_ca_installed(self):
+        """Ask mkcert whether its local CA root exists"""
         try:
             # Check if mkcert can find its CA root (indicates CA is installed)
             result = subprocess.run(['mkcert', '-CAROOT'], 
@@ -49,6 +64,7 @@ class SSLGenerator:
                                   capture_output=True, text=True, timeout=30)
             
             if result.returncode == 0:
+                self._mkcert_ca_installed = True
                 print("✅ mkcert local CA installed successfully!")
                 print("ℹ️  SSL certificates will now be automatically trusted by browsers")
                 return True
@@ -89,6 +105,29 @@ class SSLGenerator:
             print(f"Error generating SSL certificate: {str(e)}")
             return False
     
+    def cert_is_valid(self, cert_file, min_days=7):
+        """Check that a PEM certificate stays valid for at least min_days
+
+        The expiry date is read from the certificate itself and cached by
+        file mtime, so repeated checks do not parse the PEM again.
+        Unreadable or unparsable files count as invalid.
+        """
+        try:
+            mtime = cert_file.stat().st_mtime_ns
+            cached = self._cert_expiry_cache.get(str(cert_file))
+            if cached and cached[0] == mtime:
+                expires = cached[1]
+            else:
+                cert = x509.load_pem_x509_certificate(cert_file.read_bytes())
+                expires = getattr(cert, 'not_valid_after_utc', None)
+                if expires is None:  # cryptography < 42 returns a naive UTC datetime
+                    expires = cert.not_valid_after.replace(tzinfo=datetime.timezone.utc)
+                self._cert_expiry_cache[str(cert_file)] = (mtime, expires)
+        except (OSError, ValueError):
+            return False
+        
+        return expires > datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=min_days)
+    
     def _generate_with_mkcert(self, project_ssl_dir, domain):
         """Generate SSL certificate using mkcert (trusted by browsers)"""
         try:
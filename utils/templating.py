@@ -0,0 +1,34 @@
+"""Placeholder substitution for the generated project config files.
+
+The files we generate (nginx.conf, docker-compose.yml, Makefile) are full of
+``$`` syntax that belongs to the target format: nginx variables (``$uri``,
+``$1``), Compose interpolation (``${DB_USER}``) and Make expansions
+(``$(COMPOSE_CMD)``, ``$$1``).  :class:`ConfigTemplate` therefore only
+recognises ``${lowercase_name}`` placeholders and leaves every other ``$`` and
+every brace untouched, so templates can be written verbatim without any
+escaping.
+"""
+
+import string
+
+__all__ = [
+    "ConfigTemplate",
+]
+
+
+class ConfigTemplate(string.Template):
+    """``string.Template`` that only substitutes ``${lowercase_name}``.
+
+    Upper-case braced names (Compose ``.env`` variables), bare ``$name``,
+    ``$$`` and ``$(...)`` are all passed through literally.
+    """
+
+    flags = 0  # case-sensitive: ${DB_NAME} must not match
+    pattern = r"""
+    \$(?:
+      (?P<escaped>(?!))                    |  # no escape sequence
+      (?P<named>(?!))                      |  # bare $name is never a placeholder
+      {(?P<braced>[a-z_][a-z0-9_]*)}       |  # ${lowercase_name}
+      (?P<invalid>(?!))                       # anything else stays literal
+    )
+    """
@@ -14,6 +14,7 @@ Usage:
 
 import argparse
 import gzip
+import re
 import sys
 from pathlib import Path
 
@@ -139,42 +140,27 @@ def validate_plain_file(file_path, repair=False):
 
 def test_encoding_gzipped(file_path):
     """Test different encoding approaches for gzipped files"""
-    results = {
-        'utf8_clean': False,
-        'utf8_with_replacement': False,
-        'replacement_count': 0,
-        'content_sample': None
-    }
-    
-    try:
-        # Test clean UTF-8 - read entire file to catch issues anywhere
-        print("   🔍 Reading entire file to test UTF-8 encoding...")
-        with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-            content = f.read()  # Read entire file to properly test
-            results['utf8_clean'] = True
-            results['content_sample'] = content[:200]
-            return results
-    except UnicodeDecodeError as e:
-        print(f"   ⚠️  UTF-8 decode error found: {str(e)}")
-        pass
-    
-    try:
-        # Test UTF-8 with replacement
-        with gzip.open(file_path, 'rt', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-            replacement_count = content.count('�')
-            results['utf8_with_replacement'] = True
-            results['replacement_count'] = replacement_count
-            results['content_sample'] = content[:200]
-            return results
-    except Exception:
-        pass
-    
-    return results
+    # Read entire file to catch issues anywhere
+    print("   🔍 Reading entire file to test UTF-8 encoding...")
+    with gzip.open(file_path, 'rb') as f:
+        return test_encoding_bytes(f.read())
 
 
 def test_encoding_plain(file_path):
     """Test different encoding approaches for plain files"""
+    # Read entire file to catch issues anywhere
+    print("   🔍 Reading entire file to test UTF-8 encoding...")
+    with open(file_path, 'rb') as f:
+        return test_encoding_bytes(f.read())
+
+
+def test_encoding_bytes(data):
+    """
+    Test the raw bytes of a database file as UTF-8.
+
+    The file is read once in binary mode and decoded in bulk; a second,
+    replacing decode of the same bytes only runs if the strict one fails.
+    """
     results = {
         'utf8_clean': False,
         'utf8_with_replacement': False,
@@ -183,29 +169,19 @@ def test_encoding_plain(file_path):
     }
     
     try:
-        # Test clean UTF-8 - read entire file to catch issues anywhere
-        print("   🔍 Reading entire file to test UTF-8 encoding...")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()  # Read entire file to properly test
-            results['utf8_clean'] = True
-            results['content_sample'] = content[:200]
-            return results
+        # Test clean UTF-8
+        content = data.decode('utf-8')
+        results['utf8_clean'] = True
+        results['content_sample'] = content[:200]
+        return results
     except UnicodeDecodeError as e:
         print(f"   ⚠️  UTF-8 decode error found: {str(e)}")
-        pass
-    
-    try:
-        # Test UTF-8 with replacement
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-            replacement_count = content.count('�')
-            results['utf8_with_replacement'] = True
-            results['replacement_count'] = replacement_count
-            results['content_sample'] = content[:200]
-            return results
-    except Exception:
-        pass
     
+    # Test UTF-8 with replacement
+    content = data.decode('utf-8', errors='replace')
+    results['utf8_with_replacement'] = True
+    results['replacement_count'] = content.count('�')
+    results['content_sample'] = content[:200]
     return results
 
 
@@ -226,8 +202,8 @@ def repair_gzipped_file(file_path, encoding_results):
     try:
         # Read with error handling to replace invalid characters
         print("   📖 Reading file with error replacement...")
-        with gzip.open(file_path, 'rt', encoding='utf-8', errors='replace') as input_file:
-            content = input_file.read()
+        with gzip.open(file_path, 'rb') as input_file:
+            content = input_file.read().decode('utf-8', errors='replace')
         
         # Clean the content by removing replacement characters and problematic sequences
         print("   🧹 Cleaning content...")
@@ -238,7 +214,6 @@ def repair_gzipped_file(file_path, encoding_results):
         
         # Also clean common problematic sequences that could cause encoding issues
         # Remove null bytes and other control characters that shouldn't be in SQL
-        import re
         cleaned_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', cleaned_content)
         
         final_length = len(cleaned_content)
@@ -248,8 +223,8 @@ def repair_gzipped_file(file_path, encoding_results):
         
         # Write cleaned version
         print("   💾 Writing cleaned file...")
-        with gzip.open(repaired_path, 'wt', encoding='utf-8') as output_file:
-            output_file.write(cleaned_content)
+        with gzip.open(repaired_path, 'wb') as output_file:
+            output_file.write(cleaned_content.encode('utf-8'))
         
         print(f"✅ Repaired file created: {repaired_path}")
         print(f"   Original: {file_path.stat().st_size:,} bytes")
@@ -285,8 +260,8 @@ def repair_plain_file(file_path, encoding_results):
     try:
         # Read with error handling to replace invalid characters
         print("   📖 Reading file with error replacement...")
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as input_file:
-            content = input_file.read()
+        with open(file_path, 'rb') as input_file:
+            content = input_file.read().decode('utf-8', errors='replace')
         
         # Clean the content by removing replacement characters and problematic sequences
         print("   🧹 Cleaning content...")
@@ -297,7 +272,6 @@ def repair_plain_file(file_path, encoding_results):
         
         # Also clean common problematic sequences that could cause encoding issues
         # Remove null bytes and other control characters that shouldn't be in SQL
-        import re
         cleaned_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', cleaned_content)
         
         final_length = len(cleaned_content)
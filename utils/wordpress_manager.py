@@ -1,16 +1,22 @@
 import subprocess
-import shutil
+import secrets
 import re
+import string
+import time
+import traceback
 from pathlib import Path
 from .docker_compose_detect import compose_command
 from .port_allocator import PortAllocator
+from .config_manager import ConfigManager, load_env_file
 
 
 class WordPressManager:
     """Handles WordPress-specific operations"""
     
-    def __init__(self, docker_manager):
+    def __init__(self, docker_manager, config_manager=None):
         self.docker_manager = docker_manager
+        # Shared with the ProjectManager so config.json parses are cached once
+        self.config_manager = config_manager or ConfigManager()
     
     def get_debug_logs(self, project_path, lines=50):
         """Get WordPress debug logs for a project"""
@@ -23,6 +29,19 @@ class WordPressManager:
             if status.get('status') != 'running':
                 return {'success': False, 'error': 'Project must be running to view debug logs'}
             
+            # wp-content is bind-mounted from the project directory, so the log
+            # can be read on the host without exec'ing into the container
+            wp_content = project_path / 'wp-content'
+            if wp_content.is_dir():
+                try:
+                    return {'success': True, 'logs': self._tail_file(wp_content / 'debug.log', lines)}
+                except FileNotFoundError:
+                    return {'success': True, 'logs': 'No debug logs found yet. Debug logging is enabled but no errors have been logged.'}
+                except OSError:
+                    # e.g. debug.log written by www-data with mode 0600; the
+                    # container can still read it
+                    pass
+            
             # Get debug logs from WordPress container
             result = self.docker_manager.exec_command_in_container(
                 project_path, 'wordpress', ['tail', f'-{lines}', '/var/www/html/wp-content/debug.log']
@@ -40,6 +59,25 @@ class WordPressManager:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def _tail_file(self, path, lines, block_size=8192):
+        """Return the last `lines` lines of a file, like `tail -n`, reading it backwards"""
+        with open(path, 'rb') as f:
+            end = f.seek(0, 2)
+            pos = end
+            blocks = []
+            newlines = 0
+            # One extra newline: the file normally ends with one
+            while pos > 0 and newlines <= lines:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step)
+                blocks.append(block)
+                newlines += block.count(b'\n')
+        data = b''.join(reversed(blocks))
+        tail = data.splitlines(keepends=True)[-lines:] if lines > 0 else []
+        return b''.join(tail).decode('utf-8', 'replace')
+    
     def clear_debug_logs(self, project_path):
         """Clear WordPress debug logs for a project"""
         if not project_path.exists():
@@ -112,7 +150,6 @@ class WordPressManager:
             if not restart_result.get('success', False):
                 return {'success': False, 'error': 'Failed to restart WordPress container'}
             
-            import time
             time.sleep(8)  # Give WordPress entrypoint time to recreate wp-config from wp-config-docker.php
             return {'success': True, 'message': 'wp-config.php regeneration triggered. WordPress will recreate it from environment variables.'}
                 
@@ -156,8 +193,6 @@ class WordPressManager:
     def fix_wp_config_debug(self, project_path):
         """Fix wp-config.php to set WordPress debug constants to the correct values"""
         try:
-            # Create a temporary PHP script file
-            fix_script_path = project_path / "fix_debug.php"
             fix_script_content = '''<?php
 $config_path = '/var/www/html/wp-config.php';
 
@@ -241,26 +276,12 @@ file_put_contents($config_path, $content);
 echo "wp-config.php updated successfully\\n";
 ?>'''
             
-            # Write the script to a file
-            with open(fix_script_path, 'w') as f:
-                f.write(fix_script_content)
-            
-            # Copy the script to wp-content directory
-            wp_content_script_path = project_path / "wp-content" / "fix_debug.php"
-            wp_content_script_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(fix_script_path, wp_content_script_path)
-            
-            # Run the fix script in the WordPress container
+            # Run the fix script in the WordPress container; php reads it from
+            # stdin, so nothing has to be written into wp-content and cleaned up
             result = self.docker_manager.exec_command_in_container(
-                project_path, 'wordpress', ['php', '/var/www/html/wp-content/fix_debug.php']
+                project_path, 'wordpress', ['php'], input=fix_script_content.encode('utf-8')
             )
             
-            # Clean up the temporary files
-            if fix_script_path.exists():
-                fix_script_path.unlink()
-            if wp_content_script_path.exists():
-                wp_content_script_path.unlink()
-            
             if result['success']:
                 print(f"   ✅ WordPress debug configuration updated")
                 return True
@@ -278,17 +299,7 @@ echo "wp-config.php updated successfully\\n";
         Does not use WP-CLI, so it works even when wp-config has wrong $table_prefix.
         Returns (options_table, table_prefix) or (None, None) on failure.
         """
-        env_vars = {}
-        env_file = project_path / '.env'
-        if env_file.exists():
-            try:
-                with open(env_file, 'r') as f:
-                    for line in f:
-                        if '=' in line and not line.strip().startswith('#'):
-                            k, v = line.strip().split('=', 1)
-                            env_vars[k] = v
-            except Exception:
-                pass
+        env_vars = load_env_file(project_path)
         db_name = env_vars.get('DB_NAME', 'wordpress')
         db_user = env_vars.get('DB_USER', 'wordpress')
         db_password = env_vars.get('DB_PASSWORD', 'wordpress_password')
@@ -371,8 +382,11 @@ echo "wp-config.php updated successfully\\n";
             print(f"   ❌ Error running WP CLI command: {str(e)}")
             return {'success': False, 'error': str(e)}
     
-    def add_wpcli_to_project(self, project_path, config_manager, docker_manager, config):
-        """Add WP CLI service to existing project"""
+    def add_wpcli_to_project(self, project_path, config_manager, docker_manager, config, quiet=False):
+        """Add WP CLI service to existing project
+
+        With quiet=True no progress is printed; the caller reports the result.
+        """
         try:
             if not project_path.exists():
                 return {'success': False, 'error': 'Project not found'}
@@ -380,14 +394,13 @@ echo "wp-config.php updated successfully\\n";
             docker_compose_path = project_path / "docker-compose.yml"
             if docker_compose_path.exists():
                 # Check if WP CLI is already present
-                with open(docker_compose_path, 'r') as f:
-                    compose_content = f.read()
-                
-                if "wpcli:" in compose_content:
-                    print(f"   ✅ WP CLI already configured")
+                if docker_manager.compose_has_service(project_path, 'wpcli'):
+                    if not quiet:
+                        print(f"   ✅ WP CLI already configured")
                     return {'success': True, 'message': 'WP CLI is already configured for this project'}
                 
-                print(f"   Updating docker-compose.yml to include WP CLI...")
+                if not quiet:
+                    print(f"   Updating docker-compose.yml to include WP CLI...")
                 # Regenerate docker-compose with WP CLI, preserving existing ports
                 existing_ports = None
                 if config.get('port_index'):
@@ -404,14 +417,16 @@ echo "wp-config.php updated successfully\\n";
                     config.get('enable_redis', True),
                     ports=existing_ports
                 )
-                print(f"   ✅ Updated docker-compose.yml with WP CLI service")
+                if not quiet:
+                    print(f"   ✅ Updated docker-compose.yml with WP CLI service")
                 
                 return {'success': True, 'message': 'WP CLI service added successfully. Use "docker-compose --profile cli run --rm wpcli <command>" to run WP CLI commands.'}
             else:
                 return {'success': False, 'error': 'docker-compose.yml not found'}
                 
         except Exception as e:
-            print(f"   ❌ Error adding WP CLI: {str(e)}")
+            if not quiet:
+                print(f"   ❌ Error adding WP CLI: {str(e)}")
             return {'success': False, 'error': str(e)}
     
     def update_wordpress_version(self, project_path, config_manager, docker_manager, new_version):
@@ -431,10 +446,6 @@ echo "wp-config.php updated successfully\\n";
             # Update config
             config['wordpress_version'] = new_version
             
-            # Stop containers first
-            print(f"   🛑 Stopping containers...")
-            docker_manager.stop_project(project_path)
-            
             # Rebuild docker-compose.yml with new version, preserving existing ports
             print(f"   Updating docker-compose.yml...")
             existing_ports = None
@@ -443,7 +454,7 @@ echo "wp-config.php updated successfully\\n";
                 allocator = PortAllocator(projects_dir)
                 existing_ports = allocator.get_ports_for_index(config['port_index'])
 
-            docker_manager.create_docker_compose(
+            files_changed = docker_manager.create_docker_compose(
                 project_path,
                 config['name'],
                 new_version,
@@ -456,9 +467,19 @@ echo "wp-config.php updated successfully\\n";
             # Save updated config
             config_manager.update_project_config(project_path, {'wordpress_version': new_version})
             
-            # Start containers with new version
-            print(f"   🚀 Starting containers with new WordPress version...")
-            start_result = docker_manager.start_project(project_path)
+            if not files_changed:
+                # Nothing to recreate, but the project still ends up running
+                if docker_manager.get_project_status(project_path, fresh=True).get('status') != 'running':
+                    print(f"   🚀 Starting containers...")
+                    start_result = docker_manager.start_project(project_path)
+                    if not start_result['success']:
+                        return {'success': False, 'error': f'Failed to start containers: {start_result["error"]}'}
+                print(f"   ✅ docker-compose.yml unchanged, no recreate needed")
+                return {'success': True, 'message': f'WordPress version is already {new_version}'}
+            
+            # Recreate containers with new version (one `up`, no separate `down`)
+            print(f"   🚀 Recreating containers with new WordPress version...")
+            start_result = docker_manager.start_project(project_path, recreate=True)
             
             if start_result['success']:
                 print(f"   ✅ WordPress version updated successfully")
@@ -478,8 +499,7 @@ echo "wp-config.php updated successfully\\n";
                 return {'success': False, 'error': 'WP CLI service not configured'}
             
             # Get project domain from config
-            config_manager = None  # This would need to be injected
-            config = config_manager.read_project_config(project_path) if config_manager else None
+            config = self.config_manager.read_project_config(project_path)
             site_url = f"https://{config.get('domain', 'localhost')}" if config else "https://localhost"
             
             # Install WordPress
@@ -508,8 +528,6 @@ echo "wp-config.php updated successfully\\n";
             
             # Generate password if not provided
             if not password:
-                import secrets
-                import string
                 password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(12))
             
             # Create user
@@ -584,7 +602,6 @@ echo "wp-config.php updated successfully\\n";
         Comprehensive fix for database connection issues.
         Waits for MySQL, verifies wp-config.php, tests connection, and creates database if needed.
         """
-        import time
         
         try:
             # Check if containers are running
@@ -595,14 +612,7 @@ echo "wp-config.php updated successfully\\n";
             print(f"   🔧 Diagnosing database connection issue...")
             
             # Read .env file to get database credentials
-            env_file = project_path / '.env'
-            env_vars = {}
-            if env_file.exists():
-                with open(env_file, 'r') as f:
-                    for line in f:
-                        if '=' in line and not line.startswith('#'):
-                            key, value = line.strip().split('=', 1)
-                            env_vars[key] = value
+            env_vars = load_env_file(project_path)
             
             db_name = env_vars.get('DB_NAME', 'wordpress')
             db_user = env_vars.get('DB_USER', 'wordpress')
@@ -729,7 +739,6 @@ echo "wp-config.php updated successfully\\n";
                     db_host_wrong = True
                 
                 if db_host_wrong:
-                    import re
                     # Only fix DB_HOST - be very careful to preserve everything else
                     # Match: define( 'DB_HOST', 'anything' ); or define( "DB_HOST", "anything" );
                     original_config = wp_config
@@ -840,10 +849,6 @@ echo "wp-config.php updated successfully\\n";
         Uses WP-CLI to directly check and fix the installation state.
         """
         try:
-            import time
-            import json
-            from pathlib import Path
-            
             # Check if containers are running
             status = self.docker_manager.get_project_status(project_path)
             if status.get('status') != 'running':
@@ -898,28 +903,10 @@ echo "wp-config.php updated successfully\\n";
                 self.docker_manager.restart_container(project_path, 'wordpress')
                 
                 print(f"   ⏳ Waiting for MySQL to be ready after restart...")
-                env_file = project_path / '.env'
-                db_root_password = 'root_password'
-                if env_file.exists():
-                    with open(env_file, 'r') as f:
-                        for line in f:
-                            if 'DB_ROOT_PASSWORD' in line and '=' in line:
-                                db_root_password = line.split('=', 1)[1].strip()
-                                break
-                
-                mysql_ready = False
-                for attempt in range(30):
-                    result = self.docker_manager.exec_command_in_container(
-                        project_path, 'mysql', 
-                        ['sh', '-c', f'MYSQL_PWD={db_root_password} mysqladmin ping -h localhost -u root']
-                    )
-                    if result.get('success', False) and 'mysqld is alive' in result.get('output', ''):
-                        mysql_ready = True
-                        print(f"   ✅ MySQL is ready")
-                        break
-                    time.sleep(1)
-                
-                if not mysql_ready:
+                mysql_ready = self.docker_manager.wait_for_mysql(project_path, timeout=30)
+                if mysql_ready:
+                    print(f"   ✅ MySQL is ready")
+                else:
                     print(f"   ⚠️  MySQL may not be fully ready, but continuing...")
                 time.sleep(2)
                 
@@ -937,28 +924,15 @@ echo "wp-config.php updated successfully\\n";
                     return {'success': False, 'error': f'Database connection failed after restart: {db_check_result.get("error", "Unknown error")}'}
             
             # Step 6: Get project domain from config
-            config_file = project_path / 'config.json'
-            project_domain = None
-            if config_file.exists():
-                try:
-                    with open(config_file, 'r') as f:
-                        config = json.load(f)
-                        project_domain = config.get('domain', '')
-                except:
-                    pass
+            config = self.config_manager.read_project_config(project_path) or {}
+            project_domain = config.get('domain', '')
             
             if not project_domain:
                 # Try to get from .env or default
-                env_file = project_path / '.env'
-                if env_file.exists():
-                    with open(env_file, 'r') as f:
-                        for line in f:
-                            if 'DOMAIN' in line and '=' in line:
-                                project_domain = line.split('=', 1)[1].strip()
-                                break
+                project_domain = load_env_file(project_path).get('DOMAIN')
             
             # Determine protocol
-            protocol = 'https' if (config_file.exists() and json.load(open(config_file)).get('enable_ssl', False)) else 'http'
+            protocol = 'https' if config.get('enable_ssl', False) else 'http'
             site_url = f"{protocol}://{project_domain}" if project_domain else None
             
             # Step 7: Get current siteurl and home options
@@ -1020,6 +994,5 @@ echo "wp-config.php updated successfully\\n";
                 
         except Exception as e:
             print(f"   ❌ Error fixing WordPress install detection: {str(e)}")
-            import traceback
             traceback.print_exc()
             return {'success': False, 'error': f'Error fixing install detection: {str(e)}'}
\ No newline at end of file